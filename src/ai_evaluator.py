@@ -1,19 +1,453 @@
 # ai_evaluator.py
 
 import os
+import re
+import sys
 import json
+import time
+import atexit
+import hashlib
+import logging
+import asyncio
+import functools
+import threading
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import google.generativeai as genai
-from typing import Dict, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, TypedDict, Union, get_args, get_origin, get_type_hints
+from dataclasses import dataclass, asdict, replace
 from dotenv import load_dotenv
+from google.api_core import exceptions as google_exceptions
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 # Load environment variables
 load_dotenv()
 
-from config import RENTAL_INFO, SCORING_WEIGHTS, EVALUATION_KEYWORDS, API_CONFIG
+from config import (RENTAL_INFO, SCORING_WEIGHTS, EVALUATION_KEYWORDS, API_CONFIG, CACHE_CONFIG, SEMANTIC_CACHE_CONFIG,
+                    LOCAL_SCORING, QUICK_REJECT)
+import fast_json
+from response_cache import ResponseCache
+from semantic_cache import SemanticCache
+from rate_limiter import TokenBucket
+from gemini_batch import batch_mode_available, run_batch_job
+from log_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the configured model itself is unusable (renamed, retired, no access)
+MODEL_ERRORS = (google_exceptions.NotFound, google_exceptions.PermissionDenied)
+
+# Last working model name per API key (keyed by a hash of the key), persisted so new
+# processes skip the probe loop
+_MODEL_CACHE: Dict[str, str] = {}
+
+# Event loop of the synchronous entry points, running on its own thread. google-generativeai
+# keeps one grpc-asyncio client per process that only works on the loop it first ran on, so
+# sync calls reuse this loop instead of starting a new one with asyncio.run each time
+_EVALUATION_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_EVALUATION_LOOP_PID: Optional[int] = None
+_EVALUATION_LOOP_LOCK = threading.Lock()
 
+# Gemini request quota of the whole process, shared by every pool and server
+RATE_LIMITER = TokenBucket(API_CONFIG['requests_per_minute'], 60.0)
+
+# Outermost JSON object in a model reply (greedy, spans newlines)
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Criterion order of every score vector, and the matching normalized weights
+SCORE_FIELDS = tuple(SCORING_WEIGHTS)
+WEIGHT_VECTOR = np.fromiter((SCORING_WEIGHTS[field] for field in SCORE_FIELDS), dtype=float,
+                            count=len(SCORE_FIELDS)) / 100.0
+
+# Red flags marking a result that came from a failure path and must not be cached
+ERROR_FLAGS = {"AI_EVALUATION_ERROR", "PARSING_ERROR"}
+
+# Leading part of the email body that is sent to Gemini and scanned locally: a token budget,
+# or a character budget when no tokenizer is available
+BODY_EXCERPT_TOKENS = API_CONFIG['body_tokens']
+BODY_EXCERPT_CHARS = 800
+
+# Static prompt sections shared by the single and batched evaluation prompts
+PROMPT_HEADER = """You are evaluating rental applications for a 7-month furnished room in Munich (Sept 2025 - March 2026).
+The owner will return and needs their furniture kept exactly as is.
 
-@dataclass
+CRITICAL: Score based on these priorities:
+1. TIMING (35%): Exact 7 months only - no longer, no shorter
+2. FINANCIAL (25%): Can afford 636€/month + 1608€ deposit
+3. TRUSTWORTHINESS (20%): Reliable, references, stable background
+4. FURNITURE (15%): Will keep furnished setup, no changes
+5. PERSONALIZATION (5%): Thoughtful, specific application (not generic)"""
+
+EVALUATION_RUBRIC = """Rate each criterion 0-100 (bands: top / 80-90 / 60-70 / 40-50 / 0-30):
+timing_alignment: exact Sept 2025 - March 2026 (exchange semester) / 7 months, semester abroad / approximate / vague or slightly off / wrong dates, permanent, much shorter or longer
+financial_capability: stable income + deposit ready / job, BAföG, salary, parents / partial / vague / none or concerning
+trustworthiness: references + stable background + employment / job, university, previous rentals / partial / basic info only / red flags or very little info
+furniture_acceptance: loves furnished setup, keeps everything / positive, no changes / accepts / neutral / own furniture or wants changes
+personalization: specific details + personal reasons / tailored, shows research / partly generic / mostly generic / copy-paste
+red_flags: wrong dates, own furniture, no financial info, copy-paste, longer stay, group application"""
+
+RESPONSE_EXAMPLE = """{
+    "timing_alignment": 85,
+    "financial_capability": 75,
+    "trustworthiness": 80,
+    "furniture_acceptance": 90,
+    "personalization": 70,
+    "reasoning": "Exchange student with perfect timing, stable finances, loves furnished setup",
+    "red_flags": [],
+    "bonus_points": 10
+}"""
+
+
+class TenantResponse(TypedDict):
+    """Response schema for JSON mode - mirrors RESPONSE_EXAMPLE field for field"""
+    timing_alignment: int
+    financial_capability: int
+    trustworthiness: int
+    furniture_acceptance: int
+    personalization: int
+    reasoning: str
+    red_flags: List[str]
+    bonus_points: int
+
+
+class BatchTenantResponse(TenantResponse):
+    """One entry of the batched "results" array, id is the application number"""
+    id: int
+
+
+class BatchResponse(TypedDict):
+    """Response schema for batched evaluation"""
+    results: List[BatchTenantResponse]
+
+
+# JSON types of the REST responseSchema (Batch Mode requests are plain JSON, not SDK objects)
+REST_SCHEMA_TYPES = {int: "INTEGER", float: "NUMBER", str: "STRING", bool: "BOOLEAN"}
+
+
+def rest_schema(annotation) -> Dict:
+    """Gemini REST responseSchema for a TypedDict (all fields required) or one of its field types"""
+    if get_origin(annotation) is list:
+        return {"type": "ARRAY", "items": rest_schema(get_args(annotation)[0])}
+    if isinstance(annotation, type) and issubclass(annotation, dict):
+        fields = get_type_hints(annotation)
+        return {"type": "OBJECT", "properties": {name: rest_schema(field) for name, field in fields.items()},
+                "required": list(fields), "propertyOrdering": list(fields)}
+    return {"type": REST_SCHEMA_TYPES[annotation]}
+
+
+TENANT_RESPONSE_SCHEMA = rest_schema(TenantResponse)
+
+# Identical for every applicant, so it can be cached server-side (only the email block varies)
+PROMPT_PREFIX = f"""{PROMPT_HEADER}
+
+{EVALUATION_RUBRIC}
+
+Return ONLY this JSON for the applicant email below:
+{RESPONSE_EXAMPLE}"""
+
+# str.format templates over a NormalizedEmail `e`: the per-applicant block, and the full prompt
+# (braces of the JSON example in the static prefix are escaped)
+EMAIL_BLOCK_TEMPLATE = """Applicant Email:
+From: {e.sender}
+Subject: {e.subject}
+Content: {e.body_excerpt}"""
+EVALUATION_PROMPT_TEMPLATE = (PROMPT_PREFIX.replace('{', '{{').replace('}', '}}') +
+                              "\n\n" + EMAIL_BLOCK_TEMPLATE)
+
+# One numbered section per applicant in the batched prompt
+APPLICATION_SECTION_TEMPLATE = """=== APPLICATION {number} ===
+From: {e.sender}
+Subject: {e.subject}
+Content: {e.body_excerpt}"""
+
+# Keyword rules as (criterion, score, keywords): a criterion gets the score when any keyword shows up.
+# If several rules of one criterion match, the lowest score wins so negative cues beat positive ones.
+EMERGENCY_KEYWORD_RULES = [
+    ('timing_alignment', 75, ['september', 'march', '7 month', 'semester', 'exchange']),
+    ('financial_capability', 70, ['income', 'job', 'bafög', 'salary', 'parents', 'deposit']),
+    ('trustworthiness', 75, ['reference', 'reliable', 'responsible', 'previous landlord']),
+    ('furniture_acceptance', 75, ['furnished', 'möbliert', 'furniture', 'complete setup']),
+    ('personalization', 75, ['jutastraße', 'neuhausen', 'your place', 'specifically']),
+]
+
+# Rules for scoring the applicant email itself on the local fast path
+LOCAL_KEYWORD_RULES = [
+    ('timing_alignment', 85, EVALUATION_KEYWORDS['timing_exact_match']),
+    ('timing_alignment', 20, EVALUATION_KEYWORDS['timing_longer']),
+    ('financial_capability', 75, EVALUATION_KEYWORDS['financial_indicators']),
+    ('trustworthiness', 75, EVALUATION_KEYWORDS['trustworthiness_indicators']),
+    ('furniture_acceptance', 80, EVALUATION_KEYWORDS['furniture_acceptance']),
+    ('furniture_acceptance', 20, EVALUATION_KEYWORDS['furniture_problems']),
+    ('personalization', 75, EVALUATION_KEYWORDS['personalization_indicators']),
+    ('personalization', 25, EVALUATION_KEYWORDS['generic_indicators']),
+]
+
+
+def whole_word_regex(alternatives: List[str]) -> re.Pattern:
+    """Compile regex alternatives that only match whole words"""
+    return re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b')
+
+
+# Deterministic rejects that don't need Gemini, with the red flag each one raises. A reject
+# skips the model entirely, so these are whole-word regexes for explicit requests only.
+QUICK_REJECT_RULES = [
+    ('timing_alignment', 10, whole_word_regex(EVALUATION_KEYWORDS['timing_rejects'])),
+    ('furniture_acceptance', 10, whole_word_regex(EVALUATION_KEYWORDS['furniture_rejects'])),
+]
+# A reject cue right after one of these, in the same sentence, is left to Gemini
+# ("I will not bring own furniture", "I don't need any new furniture")
+NEGATION_RE = re.compile(r"\b(?:not|no|never|nothing|without|dont|wont|cant|nicht|kein\w*|nie|ohne)\b|n't\b")
+NEGATION_WINDOW_CHARS = 30
+SENTENCE_END_RE = re.compile(r"[.!?\n]")
+QUICK_REJECT_FLAGS = {
+    'timing_alignment': "Wants longer stay",
+    'furniture_acceptance': "Wants to bring own furniture",
+    'personalization': "Empty or near-empty application",
+}
+
+
+# Each rule owns one bit; a scan ORs the bits of every matched keyword into a mask.
+# Keywords must start a word ("befristet" is not found in "unbefristeten") but may be
+# followed by more letters, so inflections and plurals still count.
+def build_keyword_automaton(rules: List[Tuple[str, int, List[str]]]):
+    """Compile keyword rules into one Aho-Corasick automaton of (length, rule bits) (None without pyahocorasick)"""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for bit, (_, _, keywords) in enumerate(rules):
+        for word in map(str.casefold, keywords):
+            _, bits = automaton.get(word, (len(word), 0))
+            automaton.add_word(word, (len(word), bits | (1 << bit)))
+    automaton.make_automaton()
+    return automaton
+
+
+def keyword_regex(word: str) -> str:
+    """Regex for one keyword that only matches at the start of a word"""
+    escaped = re.escape(word.casefold())
+    return rf'(?<!\w){escaped}' if re.match(r'\w', word) else escaped
+
+
+def build_keyword_patterns(rules: List[Tuple[str, int, List[str]]]) -> List[Tuple[int, re.Pattern]]:
+    """Compile each rule's keywords into one regex alternation (fallback without pyahocorasick)"""
+    return [(1 << bit, re.compile('|'.join(map(keyword_regex, keywords))))
+            for bit, (_, _, keywords) in enumerate(rules)]
+
+
+def build_mask_table(rules: List[Tuple[str, int, List[str]]]) -> List[Dict[str, int]]:
+    """Precompute {criterion: score} for every possible rule mask (lowest score per criterion wins)"""
+    table = []
+    for mask in range(1 << len(rules)):
+        matched = {}
+        for bit, (category, score, _) in enumerate(rules):
+            if mask & (1 << bit):
+                matched[category] = min(score, matched.get(category, score))
+        table.append(matched)
+    return table
+
+
+def build_decided_table(rules: List[Tuple[str, int, List[str]]]) -> List[int]:
+    """Precompute, for every rule mask, how many criteria are matched without conflicting cues
+
+    A criterion hit by rules with different scores (e.g. "furnished" and "own furniture")
+    gets the lowest score but does not count as decided.
+    """
+    table = []
+    for mask in range(1 << len(rules)):
+        scores = {}
+        for bit, (category, score, _) in enumerate(rules):
+            if mask & (1 << bit):
+                scores.setdefault(category, set()).add(score)
+        table.append(sum(len(matched) == 1 for matched in scores.values()))
+    return table
+
+
+EMERGENCY_AUTOMATON = build_keyword_automaton(EMERGENCY_KEYWORD_RULES)
+EMERGENCY_PATTERNS = build_keyword_patterns(EMERGENCY_KEYWORD_RULES)
+EMERGENCY_MASK_TABLE = build_mask_table(EMERGENCY_KEYWORD_RULES)
+LOCAL_AUTOMATON = build_keyword_automaton(LOCAL_KEYWORD_RULES)
+LOCAL_PATTERNS = build_keyword_patterns(LOCAL_KEYWORD_RULES)
+LOCAL_MASK_TABLE = build_mask_table(LOCAL_KEYWORD_RULES)
+LOCAL_DECIDED_TABLE = build_decided_table(LOCAL_KEYWORD_RULES)
+
+
+def is_word_char(char: str) -> bool:
+    """Same notion of a word character as regex \\w"""
+    return char.isalnum() or char == '_'
+
+
+def is_negated(text: str, start: int) -> bool:
+    """True if a negation precedes position start within a few words of the same sentence"""
+    before = text[max(0, start - NEGATION_WINDOW_CHARS):start]
+    return NEGATION_RE.search(SENTENCE_END_RE.split(before)[-1]) is not None
+
+
+def scan_mask(text_lower: str, automaton, patterns: List[Tuple[int, re.Pattern]]) -> int:
+    """Bit mask of the rules with at least one keyword hit at the start of a word"""
+    mask = 0
+    if automaton is not None:
+        # One linear pass finds every keyword of every rule; hits inside a word are dropped
+        for end, (length, bits) in automaton.iter(text_lower):
+            start = end - length + 1
+            if start and is_word_char(text_lower[start]) and is_word_char(text_lower[start - 1]):
+                continue
+            mask |= bits
+    else:
+        # One C-level regex search per rule instead of a Python loop over its keywords
+        for bit, pattern in patterns:
+            if pattern.search(text_lower):
+                mask |= bit
+    return mask
+
+
+def scan_keywords(text_lower: str, automaton, patterns: List[Tuple[int, re.Pattern]],
+                  mask_table: List[Dict[str, int]]) -> Dict[str, int]:
+    """Return {criterion: score} for every criterion with at least one keyword hit
+
+    The returned dict is a shared mask_table entry - copy it before modifying.
+    """
+    return mask_table[scan_mask(text_lower, automaton, patterns)]
+
+
+def score_matrix(items: List[Dict]) -> np.ndarray:
+    """Final total scores of many parsed results: weighted sum + bonus, capped at 100, rounded"""
+    matrix = np.array([[data[field] for field in SCORE_FIELDS] for data in items], dtype=float)
+    bonuses = np.fromiter((data.get('bonus_points', 0) for data in items), dtype=float, count=len(items))
+    return np.round(np.minimum(100, matrix @ WEIGHT_VECTOR + bonuses), 1)
+
+
+def get_evaluation_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide evaluation loop, started on first use (and again in a forked worker)"""
+    global _EVALUATION_LOOP, _EVALUATION_LOOP_PID
+    with _EVALUATION_LOOP_LOCK:
+        if _EVALUATION_LOOP is None or _EVALUATION_LOOP_PID != os.getpid():
+            _EVALUATION_LOOP = asyncio.new_event_loop()
+            _EVALUATION_LOOP_PID = os.getpid()
+            threading.Thread(target=_EVALUATION_LOOP.run_forever, name="evaluation-loop", daemon=True).start()
+        return _EVALUATION_LOOP
+
+
+def run_on_evaluation_loop(coro):
+    """Run a coroutine on the evaluation loop and wait for its result
+
+    Works from any thread, including one with its own running event loop - except the
+    evaluation loop itself, where the async method has to be awaited instead.
+    """
+    loop = get_evaluation_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Synchronous evaluation called on the evaluation loop - await the async method")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer():
+    """cl100k_base encoder (close enough to Gemini's for budgeting); None if unavailable"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The encoding file is downloaded on first use, so this also fails offline
+        logger.warning("⚠️  Tokenizer unavailable (%s), truncating email bodies by characters", e)
+        return None
+
+
+def truncate_to_tokens(text: str, max_tokens: int = BODY_EXCERPT_TOKENS) -> str:
+    """Cut text to at most max_tokens tokens (to BODY_EXCERPT_CHARS characters without a tokenizer)"""
+    tokenizer = get_tokenizer()
+    if tokenizer is None:
+        return text[:BODY_EXCERPT_CHARS]
+
+    # Every token covers at least one character, so short texts can't exceed the budget
+    if len(text) <= max_tokens:
+        return text
+
+    # Bound the encoding work on very long bodies (tokens average well below 8 characters)
+    tokens = tokenizer.encode(text[:max_tokens * 8])
+    if len(tokens) <= max_tokens:
+        return text[:max_tokens * 8]
+    # A cut inside a multi-byte character decodes to U+FFFD
+    return tokenizer.decode(tokens[:max_tokens]).rstrip('\ufffd')
+
+
+class JsonObjectTracker:
+    """Follows streamed text and reports when the outermost JSON object is closed
+
+    Braces inside string literals (e.g. in "reasoning") are ignored.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.opened = False
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk; True once the outer object is complete"""
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = self.opened
+            elif char == '{':
+                self.depth += 1
+                self.opened = True
+            elif char == '}' and self.opened:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+def hash_api_key(api_key: str) -> str:
+    """Stable identifier for an API key that is safe to write to disk"""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+
+def load_cached_model_name(api_key_hash: str) -> str:
+    """Return the remembered model name for this key; KeyError if none has been probed yet"""
+    if not _MODEL_CACHE:
+        path = os.path.expanduser(CACHE_CONFIG['model_file'])
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    _MODEL_CACHE.update(fast_json.loads(f.read()))
+            except (OSError, json.JSONDecodeError):
+                logger.warning("⚠️  Invalid model cache file, probing models again")
+    return _MODEL_CACHE[api_key_hash]
+
+
+def save_cached_model_name(api_key_hash: str, model_name: str):
+    """Remember a working model name for this key in-process and on disk"""
+    _MODEL_CACHE[api_key_hash] = model_name
+    path = os.path.expanduser(CACHE_CONFIG['model_file'])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(fast_json.dumps(_MODEL_CACHE))
+
+
+@dataclass(slots=True, frozen=True)
 class TenantScore:
     """Data class for tenant evaluation scores based on your real priorities"""
     total_score: float
@@ -27,252 +461,718 @@ class TenantScore:
     bonus_points: int
 
 
+@dataclass(slots=True)
+class NormalizedEmail:
+    """Applicant email canonicalized once: prompt excerpt plus casefolded text for keyword scans"""
+    sender: str
+    subject: str
+    body_excerpt: str
+    text_lower: str
+
+    @classmethod
+    def from_email(cls, email_data: Union[Dict, 'NormalizedEmail']) -> 'NormalizedEmail':
+        """Build from an EmailReader dict (already normalized emails are returned as-is)"""
+        if isinstance(email_data, cls):
+            return email_data
+
+        body_excerpt = truncate_to_tokens(email_data['body'])
+        return cls(
+            sender=email_data['sender'],
+            subject=email_data['subject'],
+            body_excerpt=body_excerpt,
+            # casefold, not lower: "Jutastraße" and "JUTASTRASSE" must hit the same keyword
+            text_lower=f"{email_data['subject']}\n{body_excerpt}".casefold()
+        )
+
+
 class AIEvaluator:
+    # Gemini handles shared by every instance in the process (set up once by setup_gemini_api)
+    model = None
+    model_name = None
+    api_key_hash = None
+    evaluation_model = None
+    prefix_cache = None
+    prefix_cache_expires = 0.0  # time.monotonic() deadline of prefix_cache's TTL
+    prefix_cache_cleanup = False  # atexit deletion of prefix_cache registered
+    # Score caches shared by every instance in the process (opened once by setup_caches)
+    cache = None
+    semantic_cache = None
+    caches_pid = None  # Process that opened them; a forked worker opens its own
+
     def __init__(self):
         self.setup_gemini_api()
+        self.setup_caches()
+        self.pool: Optional[EvaluatorPool] = None  # Created on first bulk evaluation, then reused
+
+    @classmethod
+    def setup_caches(cls):
+        """Open the response and semantic caches once per process (the embedding model is slow to load)"""
+        if cls.caches_pid == os.getpid():
+            return
+
+        # Higher temperatures give different answers per call, so caching them would freeze one at random
+        cacheable = API_CONFIG['temperature'] <= CACHE_CONFIG['max_temperature']
+        cls.cache = ResponseCache() if CACHE_CONFIG['enabled'] and cacheable else None
+        cls.semantic_cache = SemanticCache() if SEMANTIC_CACHE_CONFIG['enabled'] else None
+        cls.caches_pid = os.getpid()
+
+    @classmethod
+    def setup_gemini_api(cls):
+        """Initialize Gemini API once per process, reusing the last working model instead of probing"""
+        if cls.model is not None:
+            return
 
-    def setup_gemini_api(self):
-        """Initialize Gemini API"""
         api_key = os.getenv('GEMINI_API_KEY')
         if not api_key:
             raise ValueError("GEMINI_API_KEY environment variable not set")
 
         genai.configure(api_key=api_key)
+        cls.api_key_hash = hash_api_key(api_key)
+
+        try:
+            model_name = load_cached_model_name(cls.api_key_hash)
+        except KeyError:
+            if os.environ.get('AI_EVAL_SKIP_PROBE'):
+                # Trust the configured model; a bad name surfaces as NotFound on the first request
+                model_name = API_CONFIG['gemini_model']
+            else:
+                model_name = cls.probe_models()
+
+        cls.use_model(model_name)
+
+    @classmethod
+    def use_model(cls, model_name: str):
+        """Bind all evaluators to a Gemini model"""
+        cls.model = genai.GenerativeModel(model_name)
+        cls.model_name = model_name
+        cls.setup_prefix_cache()
+
+    @classmethod
+    def setup_prefix_cache(cls):
+        """Attach PROMPT_PREFIX to evaluation_model so requests only send the email block
+
+        evaluation_model is the model single-applicant evaluations go through. If context
+        caching is enabled and the prefix reaches Gemini's minimum cacheable size, it is
+        registered as cached content (deleted again at exit); otherwise it is set as the
+        model's system instruction.
+        """
+        cls.delete_prefix_cache()
+        cls.evaluation_model = genai.GenerativeModel(cls.model_name, system_instruction=PROMPT_PREFIX)
+
+        if not API_CONFIG['context_caching'] or not hasattr(genai, 'caching'):
+            return
+
+        try:
+            prefix_tokens = cls.model.count_tokens(PROMPT_PREFIX).total_tokens
+            if prefix_tokens < API_CONFIG['context_cache_min_tokens']:
+                logger.info("ℹ️  Prompt prefix (%d tokens) is too small for context caching, "
+                            "sending it as system instruction", prefix_tokens)
+                return
+
+            cls.prefix_cache = genai.caching.CachedContent.create(
+                model=cls.model_name,
+                system_instruction=PROMPT_PREFIX,
+                ttl=timedelta(seconds=API_CONFIG['context_cache_ttl_seconds']),
+            )
+            cls.evaluation_model = genai.GenerativeModel.from_cached_content(cls.prefix_cache)
+            cls.prefix_cache_expires = time.monotonic() + API_CONFIG['context_cache_ttl_seconds']
+            logger.info("🗄️  Evaluation prompt prefix cached on Gemini (%s)", cls.prefix_cache.name)
+            if not cls.prefix_cache_cleanup:
+                atexit.register(cls.delete_prefix_cache)
+                cls.prefix_cache_cleanup = True
+        except Exception as e:
+            logger.info("⚠️  Context caching unavailable, sending the prefix as system instruction: %s", e)
+            cls.prefix_cache = None
+
+    @classmethod
+    def delete_prefix_cache(cls):
+        """Remove the cached prefix from Gemini instead of leaving it to expire (and be billed) on its own"""
+        prefix_cache, cls.prefix_cache = cls.prefix_cache, None
+        if prefix_cache is None:
+            return
+
+        try:
+            prefix_cache.delete()
+        except Exception as e:
+            logger.debug("Could not delete cached prompt prefix %s: %s", prefix_cache.name, e)
+
+    @classmethod
+    def prefix_cache_due(cls) -> bool:
+        """Whether the cached prefix's TTL is about to run out"""
+        return (cls.prefix_cache is not None and
+                time.monotonic() >= cls.prefix_cache_expires - API_CONFIG['context_cache_refresh_seconds'])
 
-        # Try models in order of success
+    @classmethod
+    def refresh_prefix_cache(cls):
+        """Extend the cached prefix's TTL shortly before it runs out, so busy runs never hit an expired cache"""
+        if not cls.prefix_cache_due():
+            return
+
+        try:
+            cls.prefix_cache.update(ttl=timedelta(seconds=API_CONFIG['context_cache_ttl_seconds']))
+            cls.prefix_cache_expires = time.monotonic() + API_CONFIG['context_cache_ttl_seconds']
+            logger.debug("Extended cached prompt prefix %s", cls.prefix_cache.name)
+        except Exception as e:
+            logger.info("♻️  Could not extend cached prompt prefix (%s), recreating it...", e)
+            cls.setup_prefix_cache()
+
+    @classmethod
+    def probe_models(cls) -> str:
+        """Pick the first preferred model this API key can use (one list_models call) and remember it on disk"""
+        # Preferred models, most reliable first
         model_names = [
-            "gemini-2.0-flash",  # Most reliable
-            "gemini-1.5-pro",
             "gemini-2.0-flash",
+            "gemini-1.5-pro",
             API_CONFIG['gemini_model'],
         ]
 
+        try:
+            available = {model.name.removeprefix('models/') for model in genai.list_models()
+                         if 'generateContent' in model.supported_generation_methods}
+        except Exception as e:
+            raise ValueError(f"Could not list Gemini models, please check the API key: {e}") from e
+
         for model_name in model_names:
-            try:
-                self.model = genai.GenerativeModel(model_name)
-                # Test with academic evaluation approach
-                test_response = self.model.generate_content(
-                    "Test response: {\"timing\": 85}"
-                )
-                print(f"✅ Gemini API configured successfully with model: {model_name}")
-                return
-            except Exception as e:
-                print(f"❌ Model {model_name} failed: {e}")
-                continue
+            if model_name in available:
+                logger.info("✅ Gemini API configured successfully with model: %s", model_name)
+                save_cached_model_name(cls.api_key_hash, model_name)
+                return model_name
 
         raise ValueError("No working Gemini model found. Please check API key and model availability.")
 
-    def evaluate_candidate(self, email_data: Dict) -> TenantScore:
-        """Evaluate a tenant candidate based on YOUR real priorities"""
+    def recover_model(self, error: Exception) -> bool:
+        """Recover from a rejected request; True if it is worth retrying
 
-        prompt = self.create_evaluation_prompt(email_data)
+        A NotFound while the prompt prefix is cached most likely means the cached content
+        expired, so it is recreated; otherwise the model itself is gone and we re-probe.
+        """
+        if self.prefix_cache is not None and isinstance(error, google_exceptions.NotFound):
+            logger.info("♻️  Cached prompt prefix %s is gone, recreating it...", self.prefix_cache.name)
+            self.setup_prefix_cache()
+            return True
 
+        logger.warning("⚠️  Model %s unavailable (%s), probing for another one...", self.model_name, error)
         try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=800,
-                    temperature=0.1,
-                )
-            )
+            self.use_model(self.probe_models())
+            return True
+        except ValueError:
+            return False
+
+    def evaluate_candidate(self, email_data: Union[Dict, NormalizedEmail],
+                           force_refresh: bool = False) -> TenantScore:
+        """Evaluate a tenant candidate based on YOUR real priorities"""
+        return run_on_evaluation_loop(self.evaluate_candidate_async(email_data, force_refresh))
+
+    async def evaluate_candidate_async(self, email_data: Union[Dict, NormalizedEmail],
+                                       force_refresh: bool = False,
+                                       rate_limiter: Optional[TokenBucket] = None) -> TenantScore:
+        """Evaluate a tenant candidate, awaiting the Gemini call instead of blocking
+
+        If a rate_limiter is given, a token is taken before every Gemini request
+        (cache hits and local scores don't count against the quota).
+        """
+
+        email = NormalizedEmail.from_email(email_data)
+        rejected = self.quick_reject(email)
+        if rejected:
+            return rejected
 
-            response_text = self.extract_response_text(response)
-            result = self.parse_ai_response(response_text)
+        prompt = self.create_evaluation_prompt(email)
 
-            print(f"🤖 AI Evaluation completed for: {email_data['sender']}")
-            print(f"   Total Score: {result.total_score}/100")
+        cached = self.get_cached_score(email, prompt, force_refresh)
+        if cached:
+            return cached
 
+        local_score, confidence = self.local_fast_score(email)
+        if self.use_local_score(confidence):
+            logger.info("⚡ Local keyword score for %s: %s/100", email.sender, local_score.total_score)
+            return local_score
+
+        for attempt in range(2):
+            try:
+                if rate_limiter is not None:
+                    await rate_limiter.acquire()
+                if self.prefix_cache_due():
+                    # The TTL update is a blocking API call - keep it off the event loop
+                    await asyncio.to_thread(self.refresh_prefix_cache)
+                response = await self.evaluation_model.generate_content_async(
+                    self.create_email_block(email),
+                    generation_config=self.get_generation_config(),
+                    stream=True
+                )
+                result = self.blend_with_local(self.score_response(email, await self.read_stream_async(response)),
+                                               local_score)
+                self.cache_score(email, prompt, result)
+                return result
+
+            except MODEL_ERRORS as e:
+                # Cached model went away - re-probe once, then retry
+                if attempt or not await asyncio.to_thread(self.recover_model, e):
+                    return self.error_score(e)
+
+            except Exception as e:
+                return self.error_score(e)
+
+    def quick_reject(self, email: NormalizedEmail) -> Optional[TenantScore]:
+        """Score obvious rejects (longer stay, own furniture, near-empty email) locally; None otherwise"""
+        if not QUICK_REJECT['enabled']:
+            return None
+
+        rejected = {criterion: score for criterion, score, pattern in QUICK_REJECT_RULES
+                    if any(not is_negated(email.text_lower, match.start())
+                           for match in pattern.finditer(email.text_lower))}
+        if len(email.body_excerpt.strip()) < QUICK_REJECT['min_body_chars']:
+            rejected['personalization'] = 10
+        if not rejected:
+            return None
+
+        local_score, _ = self.local_fast_score(email)
+        data = {criterion: rejected.get(criterion, getattr(local_score, criterion)) for criterion in SCORE_FIELDS}
+        data['red_flags'] = [QUICK_REJECT_FLAGS[criterion] for criterion in rejected]
+        data['reasoning'] = f"Pre-filter: {', '.join(data['red_flags'])}"
+        result = self.compute_score(data)
+        logger.info("⛔ Pre-filter rejected %s: %s/100", email.sender, result.total_score)
+        return result
+
+    def local_fast_score(self, email: NormalizedEmail) -> Tuple[TenantScore, float]:
+        """Deterministic keyword scoring of the email itself, returns (score, confidence)
+
+        Confidence is the share of criteria the keywords decided without conflicting cues;
+        criteria without any hit stay at 50.
+        """
+        mask = scan_mask(email.text_lower, LOCAL_AUTOMATON, LOCAL_PATTERNS)
+        matched = LOCAL_MASK_TABLE[mask]
+        confidence = LOCAL_DECIDED_TABLE[mask] / len(SCORING_WEIGHTS)
+
+        data = {criterion: matched.get(criterion, 50) for criterion in SCORING_WEIGHTS}
+        data['reasoning'] = f"Local keyword scoring ({len(matched)}/{len(SCORING_WEIGHTS)} criteria matched)"
+        return self.compute_score(data), confidence
+
+    def use_local_score(self, confidence: float) -> bool:
+        """Whether a local keyword score this confident replaces the Gemini call"""
+        return LOCAL_SCORING['fast_path_enabled'] and confidence >= LOCAL_SCORING['confidence_threshold']
+
+    def blend_with_local(self, result: TenantScore, local_score: TenantScore) -> TenantScore:
+        """Use the local keyword score as a prior: weighted average with Gemini's criterion scores"""
+        if not LOCAL_SCORING['blend_enabled'] or ERROR_FLAGS.intersection(result.red_flags):
             return result
 
+        prior_weight = LOCAL_SCORING['prior_weight']
+        data = {
+            criterion: round(prior_weight * getattr(local_score, criterion) +
+                             (1 - prior_weight) * getattr(result, criterion))
+            for criterion in SCORING_WEIGHTS
+        }
+        data.update(reasoning=result.reasoning, red_flags=result.red_flags, bonus_points=result.bonus_points)
+        return self.compute_score(data)
+
+    def get_cached_score(self, email: NormalizedEmail, prompt: str,
+                         force_refresh: bool = False) -> Optional[TenantScore]:
+        """Look up a stored score: exact prompt match first, then a near-duplicate email"""
+        if force_refresh:
+            return None
+
+        if self.cache is not None:
+            data = self.cache.get(self.cache_key(prompt))
+            if data:
+                return TenantScore(**data)
+
+        if self.semantic_cache is not None:
+            hit = self.semantic_cache.lookup(email.body_excerpt)
+            if hit:
+                data, similarity = hit
+                score = TenantScore(**data)
+                logger.info("♻️  Reusing score of a near-duplicate application (similarity %.2f)", similarity)
+                return replace(score, reasoning=f"[semantic cache hit, similarity {similarity:.2f}] "
+                                                f"{score.reasoning}")
+
+        return None
+
+    def cache_key(self, prompt: str) -> str:
+        """Exact-cache key for a prompt under the current model and temperature"""
+        return ResponseCache.make_key(self.model_name, prompt, API_CONFIG['temperature'])
+
+    def cache_score(self, email: NormalizedEmail, prompt: str, result: TenantScore):
+        """Persist a successfully parsed score (failure results are never cached)"""
+        if ERROR_FLAGS.intersection(result.red_flags):
+            return
+
+        if self.cache is not None:
+            self.cache.set(self.cache_key(prompt), asdict(result))
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(email.body_excerpt, asdict(result))
+
+    def get_pool(self) -> 'EvaluatorPool':
+        """This evaluator's pool, so concurrency is bounded across calls and not just within one"""
+        if self.pool is None:
+            self.pool = EvaluatorPool(self)
+        return self.pool
+
+    async def evaluate_candidates_async(self, emails: List[Dict]) -> List[TenantScore]:
+        """Evaluate many candidates concurrently within the pool's concurrency and the QPM quota"""
+        return await self.get_pool().evaluate_all(emails)
+
+    def evaluate_candidates(self, emails: List[Dict]) -> List[TenantScore]:
+        """Synchronous wrapper around evaluate_candidates_async (results keep input order)"""
+        if not emails:
+            return []
+        return run_on_evaluation_loop(self.evaluate_candidates_async(emails))
+
+    def evaluate_candidates_batched(self, emails: List[Dict],
+                                    batch_size: int = API_CONFIG['batch_size']) -> List[TenantScore]:
+        """Evaluate candidates with several applicants per Gemini call (results keep input order)"""
+        normalized, results, pending = self.triage(emails)
+        self.evaluate_pending_batched(normalized, results, pending, batch_size)
+        return results
+
+    def evaluate_candidates_batch_mode(self, emails: List[Dict]) -> List[TenantScore]:
+        """Evaluate candidates through Gemini Batch Mode (half price, asynchronous) for offline sweeps
+
+        Blocks until the batch job finishes. Without google-genai installed this is the same
+        as evaluate_candidates_batched.
+        """
+        if not batch_mode_available():
+            logger.warning("⚠️  google-genai not installed, using batched prompts instead of Batch Mode")
+            return self.evaluate_candidates_batched(emails)
+
+        normalized, results, pending = self.triage(emails)
+        if not pending:
+            return results
+
+        requests = {str(i): self.create_batch_mode_request(normalized[i]) for i in pending}
+        try:
+            texts = run_batch_job(requests, f"models/{self.model_name}")
         except Exception as e:
-            print(f"❌ Error during AI evaluation: {e}")
-            return TenantScore(
-                total_score=0,
-                timing_alignment=0,
-                financial_capability=0,
-                trustworthiness=0,
-                furniture_acceptance=0,
-                personalization=0,
-                reasoning=f"Error during evaluation: {str(e)}",
-                red_flags=["AI_EVALUATION_ERROR"],
-                bonus_points=0
+            logger.error("❌ Gemini Batch Mode job failed: %s", e)
+            texts = {}
+
+        missing = []
+        for i in pending:
+            if str(i) not in texts:
+                missing.append(i)
+                continue
+
+            email = normalized[i]
+            result = self.blend_with_local(self.score_response(email, texts[str(i)]),
+                                           self.local_fast_score(email)[0])
+            self.cache_score(email, self.create_evaluation_prompt(email), result)
+            results[i] = result
+
+        # Failed requests (or a failed job) are retried with regular batched prompts
+        self.evaluate_pending_batched(normalized, results, missing, API_CONFIG['batch_size'])
+        return results
+
+    def triage(self, emails: List[Dict]) -> Tuple[List[NormalizedEmail], List[Optional[TenantScore]], List[int]]:
+        """Score what doesn't need Gemini (pre-filter, caches, confident local score)
+
+        Returns the normalized emails, the results so far and the indices still to evaluate.
+        """
+        normalized = [NormalizedEmail.from_email(email_data) for email_data in emails]
+        results: List[Optional[TenantScore]] = [None] * len(normalized)
+        pending = []
+
+        for i, email in enumerate(normalized):
+            rejected = self.quick_reject(email)
+            if rejected:
+                results[i] = rejected
+                continue
+
+            cached = self.get_cached_score(email, self.create_evaluation_prompt(email))
+            local_score, confidence = self.local_fast_score(email)
+            if cached:
+                results[i] = cached
+            elif self.use_local_score(confidence):
+                results[i] = local_score
+            else:
+                pending.append(i)
+
+        return normalized, results, pending
+
+    def evaluate_pending_batched(self, normalized: List[NormalizedEmail], results: List[Optional[TenantScore]],
+                                 pending: List[int], batch_size: int):
+        """Fill results[i] for every pending index, batch_size applicants per Gemini call"""
+        if pending:
+            run_on_evaluation_loop(self.evaluate_pending_batched_async(normalized, results, pending, batch_size))
+
+    async def evaluate_pending_batched_async(self, normalized: List[NormalizedEmail],
+                                             results: List[Optional[TenantScore]], pending: List[int],
+                                             batch_size: int):
+        """Async evaluate_pending_batched: batches run concurrently, within the pool's limits"""
+        pool = self.get_pool()
+
+        async def run_batch(indices: List[int]):
+            async with pool.semaphore:
+                scores = await self.evaluate_batch_async([normalized[i] for i in indices],
+                                                         rate_limiter=pool.rate_limiter)
+            for i, score in zip(indices, scores):
+                results[i] = score
+
+        await asyncio.gather(*[run_batch(pending[start:start + batch_size])
+                               for start in range(0, len(pending), batch_size)])
+
+    async def evaluate_batch_async(self, emails: List[NormalizedEmail],
+                                   rate_limiter: Optional[TokenBucket] = None) -> List[TenantScore]:
+        """Score one batch of applicants with a single prompt
+
+        The rate_limiter also covers the single-applicant fallbacks for missing entries.
+        """
+        try:
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            response = await self.model.generate_content_async(
+                self.create_batch_prompt(emails),
+                generation_config=self.get_batch_generation_config(len(emails))
             )
+            items = self.parse_batch_response(self.extract_response_text(response), len(emails))
+            scores = self.finish_batch(emails, items)
+        except Exception as e:
+            logger.error("❌ Error during batched AI evaluation: %s", e)
+            scores = [None] * len(emails)
+
+        # Missing or malformed entries fall back to a single-applicant call
+        return [score if score is not None else await self.evaluate_candidate_async(email, rate_limiter=rate_limiter)
+                for email, score in zip(emails, scores)]
+
+    def finish_batch(self, emails: List[NormalizedEmail], items: Dict[int, Dict]) -> List[Optional[TenantScore]]:
+        """Score, blend and cache the parsed batch entries (None where an applicant's entry is missing)"""
+        parsed = dict(zip(items, self.compute_scores(list(items.values()))))
+
+        scores = []
+        for i, email in enumerate(emails):
+            if i not in parsed:
+                scores.append(None)
+                continue
+
+            result = self.blend_with_local(parsed[i], self.local_fast_score(email)[0])
+            logger.info("🤖 AI Evaluation completed for %s: %s/100", email.sender, result.total_score)
+            self.cache_score(email, self.create_evaluation_prompt(email), result)
+            scores.append(result)
+
+        return scores
+
+    def parse_batch_response(self, response_text: str, count: int) -> Dict[int, Dict]:
+        """Parse {"results": [...]} into {batch index: score data} (application numbers start at 1)
+
+        The ids must be exactly 1..count; a skipped, repeated or renumbered entry could hand
+        one applicant's score to another, so then nothing is used and every applicant of the
+        batch falls back to a single evaluation.
+        """
+        match = JSON_OBJECT_RE.search(response_text)
+        if not match:
+            logger.warning("❌ No JSON object found in batched AI response")
+            return {}
+
+        try:
+            data = fast_json.loads(match.group(0))
+        except json.JSONDecodeError as e:
+            logger.warning("❌ Failed to parse batched AI response as JSON: %s", e)
+            return {}
+
+        items = data.get('results') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            logger.warning("❌ Batched AI response has no \"results\" list")
+            return {}
+
+        try:
+            parsed = {int(item['id']) - 1: item for item in items}
+        except (TypeError, KeyError, ValueError):
+            parsed = None
+        if parsed is None or len(items) != count or sorted(parsed) != list(range(count)):
+            logger.warning("❌ Batched AI response ids don't match applications 1..%d", count)
+            return {}
+        return parsed
+
+    def get_generation_config(self):
+        """Generation settings shared by the sync and async evaluation paths
+
+        JSON mode constrains decoding to TenantResponse, so the token budget only
+        has to fit that one object.
+        """
+        return genai.types.GenerationConfig(
+            max_output_tokens=API_CONFIG['max_tokens'],
+            temperature=API_CONFIG['temperature'],
+            response_mime_type="application/json",
+            response_schema=TenantResponse,
+        )
+
+    def get_batch_generation_config(self, batch_size: int):
+        """Generation settings for a prompt scoring batch_size applicants"""
+        return genai.types.GenerationConfig(
+            max_output_tokens=API_CONFIG['batch_item_tokens'] * batch_size,
+            temperature=API_CONFIG['temperature'],
+            response_mime_type="application/json",
+            response_schema=BatchResponse,
+        )
+
+    async def read_stream_async(self, response) -> str:
+        """Collect a streamed response, stopping as soon as the outer JSON object is closed"""
+        chunks = []
+        tracker = JsonObjectTracker()
+        async for chunk in response:
+            text = self.chunk_text(chunk)
+            chunks.append(text)
+            if tracker.feed(text):
+                break
+        return ''.join(chunks)
+
+    def chunk_text(self, chunk) -> str:
+        """Text of one streamed chunk ('' for chunks that only carry metadata)"""
+        try:
+            return chunk.text
+        except (AttributeError, ValueError):
+            return ''
 
-    def create_evaluation_prompt(self, email_data: Dict) -> str:
-        """Create evaluation prompt based on YOUR real priorities"""
+    def score_response(self, email: NormalizedEmail, response_text: str) -> TenantScore:
+        """Turn the raw Gemini response text into a TenantScore"""
+        result = self.parse_ai_response(response_text)
+
+        logger.info("🤖 AI Evaluation completed for %s: %s/100", email.sender, result.total_score)
+
+        return result
+
+    def error_score(self, error: Exception) -> TenantScore:
+        """Zero score returned when the AI evaluation itself fails"""
+        logger.error("❌ Error during AI evaluation: %s", error)
+        return TenantScore(
+            total_score=0,
+            timing_alignment=0,
+            financial_capability=0,
+            trustworthiness=0,
+            furniture_acceptance=0,
+            personalization=0,
+            reasoning=f"Error during evaluation: {str(error)}",
+            red_flags=["AI_EVALUATION_ERROR"],
+            bonus_points=0
+        )
+
+    def create_evaluation_prompt(self, email: NormalizedEmail) -> str:
+        """Full evaluation prompt based on YOUR real priorities (static prefix + email block)
+
+        Gemini only receives the email block (the prefix is attached to evaluation_model);
+        the full prompt keys the response cache.
+        """
+        return EVALUATION_PROMPT_TEMPLATE.format(e=email)
+
+    def create_email_block(self, email: NormalizedEmail) -> str:
+        """The only per-applicant part of the evaluation prompt"""
+        return EMAIL_BLOCK_TEMPLATE.format(e=email)
+
+    def create_batch_mode_request(self, email: NormalizedEmail) -> Dict:
+        """Batch Mode GenerateContentRequest for one applicant (REST JSON shape)"""
+        return {
+            "systemInstruction": {"parts": [{"text": PROMPT_PREFIX}]},
+            "contents": [{"role": "user", "parts": [{"text": self.create_email_block(email)}]}],
+            "generationConfig": {
+                "maxOutputTokens": API_CONFIG['max_tokens'],
+                "temperature": API_CONFIG['temperature'],
+                "responseMimeType": "application/json",
+                "responseSchema": TENANT_RESPONSE_SCHEMA,
+            },
+        }
+
+    def create_batch_prompt(self, emails: List[NormalizedEmail]) -> str:
+        """Create one prompt that scores several numbered applications, answered as {"results": [...]}"""
+        sections = "\n\n".join(
+            APPLICATION_SECTION_TEMPLATE.format(number=number, e=e)
+            for number, e in enumerate(emails, 1)
+        )
 
         prompt = f"""
-You are evaluating rental applications for a 7-month furnished room in Munich (Sept 2025 - March 2026).
-The owner will return and needs their furniture kept exactly as is.
+{PROMPT_HEADER}
 
-CRITICAL: Score based on these priorities:
-1. TIMING (35%): Exact 7 months only - no longer, no shorter
-2. FINANCIAL (25%): Can afford 636€/month + 1608€ deposit  
-3. TRUSTWORTHINESS (20%): Reliable, references, stable background
-4. FURNITURE (15%): Will keep furnished setup, no changes
-5. PERSONALIZATION (5%): Thoughtful, specific application (not generic)
-
-Applicant Email:
-From: {email_data['sender']}
-Subject: {email_data['subject']}
-Content: {email_data['body'][:800]}
-
-Rate each criterion (0-100):
-
-TIMING_ALIGNMENT: 
-- 100: Explicitly needs Sept 2025 - March 2026 (exchange semester, exact dates)
-- 80-90: Mentions 7 months, semester abroad, temporary stay
-- 60-70: Mentions approximate timeframe but not exact
-- 40-50: Vague timing or slightly different dates
-- 0-30: Wrong dates, wants permanent, or much shorter/longer
-
-FINANCIAL_CAPABILITY:
-- 100: Clear stable income + mentions deposit readiness
-- 80-90: Good job/income mentioned (BAföG, salary, parents)
-- 60-70: Some financial info but not complete
-- 40-50: Vague financial mentions
-- 0-30: No financial info or concerning financial situation
-
-TRUSTWORTHINESS:
-- 100: References offered + stable background + employment
-- 80-90: Good background indicators (job, university, previous rentals)
-- 60-70: Some trust indicators but incomplete
-- 40-50: Basic info but no strong trust signals
-- 0-30: Red flags or very little information
-
-FURNITURE_ACCEPTANCE:
-- 100: Explicitly loves furnished setup, mentions keeping everything
-- 80-90: Positive about furnished room, no changes mentioned
-- 60-70: Accepts furnished but not enthusiastic
-- 40-50: Neutral about furniture
-- 0-30: Mentions own furniture or wanting changes
-
-PERSONALIZATION:
-- 100: Specific details about your place, personal reasons
-- 80-90: Clearly tailored application, shows research
-- 60-70: Some personalization but generic elements
-- 40-50: Mostly generic with minor personal touches
-- 0-30: Obviously copy-pasted, no personalization
-
-RED FLAGS to check:
-- Wrong timing/dates
-- Wants to bring own furniture
-- No financial info
-- Generic copy-paste application
-- Wants longer stay
-- Group applications
-
-Return ONLY this JSON:
-{{
-    "timing_alignment": 85,
-    "financial_capability": 75,
-    "trustworthiness": 80,
-    "furniture_acceptance": 90,
-    "personalization": 70,
-    "reasoning": "Exchange student with perfect timing, stable finances, loves furnished setup",
-    "red_flags": [],
-    "bonus_points": 10
-}}
+{EVALUATION_RUBRIC}
+
+Return ONLY a JSON object {{"results": [...]}} with one object per application, in order.
+Each object has the application number as "id" plus exactly the fields of this example:
+{RESPONSE_EXAMPLE}
+
+Score each of the {len(emails)} applications below independently:
+
+{sections}
 """
         return prompt.strip()
 
     def extract_response_text(self, response) -> str:
         """Extract text from Gemini response (handles different API versions)"""
+        # Happy path for current SDKs: first part of the first candidate
         try:
-            # Method 1: Try candidates path first (most reliable for new API)
-            if hasattr(response, 'candidates') and response.candidates:
-                candidate = response.candidates[0]
-                if hasattr(candidate, 'content') and candidate.content:
-                    content = candidate.content
-                    if hasattr(content, 'parts') and content.parts:
-                        part = content.parts[0]
-                        if hasattr(part, 'text') and part.text:
-                            return part.text
-
-            # Method 2: Try direct text access
-            try:
-                if hasattr(response, 'text') and response.text:
-                    return response.text
-            except ValueError:
-                pass
+            return response.candidates[0].content.parts[0].text
+        except (AttributeError, IndexError, TypeError):
+            logger.debug("Response has no candidates[0].content.parts[0].text, trying .text")
 
-            # Method 3: Direct parts access
-            if hasattr(response, 'parts') and response.parts:
-                if response.parts[0] and hasattr(response.parts[0], 'text'):
-                    return response.parts[0].text
+        # Quick accessor raises ValueError on multi-part or blocked responses
+        try:
+            return response.text
+        except (AttributeError, ValueError):
+            logger.debug("Response .text not available, trying .parts")
 
-            # Emergency fallback
-            return str(response)
+        try:
+            return response.parts[0].text
+        except (AttributeError, IndexError, TypeError):
+            # Only now is it worth asking why: a blocked prompt yields no text at all
+            block_reason = getattr(getattr(response, 'prompt_feedback', None), 'block_reason', None)
+            if block_reason:
+                logger.warning("⚠️  Gemini blocked the prompt (%s)", block_reason)
+            logger.debug("Response has no text parts, falling back to str(response)")
 
-        except Exception as e:
-            print(f"❌ Error extracting response text: {e}")
-            return f"Extraction failed: {str(e)}"
+        return str(response)
 
     def parse_ai_response(self, response_text: str) -> TenantScore:
         """Parse AI response and calculate weighted total score based on YOUR priorities"""
         try:
-            # Clean response text
-            response_text = response_text.strip()
-
-            # Handle markdown code blocks
-            if response_text.startswith('```json'):
-                start = response_text.find('{')
-                end = response_text.rfind('}') + 1
-                response_text = response_text[start:end]
-            elif response_text.startswith('```'):
-                start = response_text.find('{')
-                end = response_text.rfind('}') + 1
-                response_text = response_text[start:end]
-
-            # Find JSON in response
-            if '{' in response_text and '}' in response_text:
-                start = response_text.find('{')
-                end = response_text.rfind('}') + 1
-                response_text = response_text[start:end]
-
-            data = json.loads(response_text)
-
-            # Validate required fields with YOUR priorities
-            required_fields = ['timing_alignment', 'financial_capability', 'trustworthiness',
-                              'furniture_acceptance', 'personalization']
-
-            for field in required_fields:
-                if field not in data:
-                    print(f"⚠️ Missing field: {field}, setting to 50")
-                    data[field] = 50
-
-            # Calculate weighted total score with YOUR priorities
-            total_score = (
-                data['timing_alignment'] * SCORING_WEIGHTS['timing_alignment'] / 100 +
-                data['financial_capability'] * SCORING_WEIGHTS['financial_capability'] / 100 +
-                data['trustworthiness'] * SCORING_WEIGHTS['trustworthiness'] / 100 +
-                data['furniture_acceptance'] * SCORING_WEIGHTS['furniture_acceptance'] / 100 +
-                data['personalization'] * SCORING_WEIGHTS['personalization'] / 100
-            )
-
-            # Add bonus points
-            bonus_points = data.get('bonus_points', 0)
-            total_score += bonus_points
-
-            return TenantScore(
-                total_score=round(min(100, total_score), 1),
-                timing_alignment=data['timing_alignment'],
-                financial_capability=data['financial_capability'],
-                trustworthiness=data['trustworthiness'],
-                furniture_acceptance=data['furniture_acceptance'],
-                personalization=data['personalization'],
-                reasoning=data.get('reasoning', 'No reasoning provided'),
-                red_flags=data.get('red_flags', []),
-                bonus_points=bonus_points
-            )
+            # First '{' to last '}' - also strips markdown code fences and surrounding prose
+            match = JSON_OBJECT_RE.search(response_text)
+            data = fast_json.loads(match.group(0) if match else response_text)
+            return self.compute_score(data)
 
         except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse AI response as JSON: {e}")
+            logger.warning("❌ Failed to parse AI response as JSON: %s", e)
             return self.emergency_parse_response(response_text)
 
+    def compute_score(self, data: Dict) -> TenantScore:
+        """Build a TenantScore (weighted total + bonus) from the parsed criterion scores"""
+        self.fill_missing_fields(data)
+
+        # Calculate weighted total score with YOUR priorities (one dot product)
+        scores = np.fromiter((data[field] for field in SCORE_FIELDS), dtype=float, count=len(SCORE_FIELDS))
+        weighted = float(scores @ WEIGHT_VECTOR)
+        return self.make_tenant_score(data, round(min(100, weighted + data.get('bonus_points', 0)), 1))
+
+    def compute_scores(self, items: List[Dict]) -> List[TenantScore]:
+        """Vectorized compute_score: all totals from one score_matrix call"""
+        if not items:
+            return []
+
+        for data in items:
+            self.fill_missing_fields(data)
+
+        totals = score_matrix(items)
+        return [self.make_tenant_score(data, float(total)) for data, total in zip(items, totals)]
+
+    def fill_missing_fields(self, data: Dict):
+        """Validate required fields with YOUR priorities, defaulting missing ones to 50"""
+        for field in SCORE_FIELDS:
+            if field not in data:
+                logger.warning("⚠️ Missing field: %s, setting to 50", field)
+                data[field] = 50
+
+    def make_tenant_score(self, data: Dict, total_score: float) -> TenantScore:
+        """Wrap the parsed fields and the final (bonus-inclusive, capped) total in a TenantScore"""
+        return TenantScore(
+            total_score=total_score,
+            timing_alignment=data['timing_alignment'],
+            financial_capability=data['financial_capability'],
+            trustworthiness=data['trustworthiness'],
+            furniture_acceptance=data['furniture_acceptance'],
+            personalization=data['personalization'],
+            reasoning=data.get('reasoning', 'No reasoning provided'),
+            red_flags=data.get('red_flags', []),
+            bonus_points=data.get('bonus_points', 0)
+        )
+
     def emergency_parse_response(self, response_text: str) -> TenantScore:
         """Emergency parser if JSON parsing fails - based on YOUR priorities"""
-        print("🚨 Using emergency response parser...")
+        logger.warning("🚨 Using emergency response parser...")
 
         scores = {
             'timing_alignment': 50,
@@ -282,29 +1182,10 @@ Return ONLY this JSON:
             'personalization': 50
         }
 
-        text_lower = response_text.lower()
-
-        # Check timing indicators
-        if any(word in text_lower for word in ['september', 'march', '7 month', 'semester', 'exchange']):
-            scores['timing_alignment'] = 75
-
-        # Check financial indicators
-        if any(word in text_lower for word in ['income', 'job', 'bafög', 'salary', 'parents', 'deposit']):
-            scores['financial_capability'] = 70
+        scores.update(scan_keywords(response_text.casefold(), EMERGENCY_AUTOMATON, EMERGENCY_PATTERNS,
+                                    EMERGENCY_MASK_TABLE))
 
-        # Check trustworthiness
-        if any(word in text_lower for word in ['reference', 'reliable', 'responsible', 'previous landlord']):
-            scores['trustworthiness'] = 75
-
-        # Check furniture acceptance
-        if any(word in text_lower for word in ['furnished', 'möbliert', 'furniture', 'complete setup']):
-            scores['furniture_acceptance'] = 75
-
-        # Check personalization
-        if any(word in text_lower for word in ['jutastraße', 'neuhausen', 'your place', 'specifically']):
-            scores['personalization'] = 75
-
-        total_score = sum(scores[key] * SCORING_WEIGHTS[key] / 100 for key in scores)
+        total_score = float(np.array([scores[field] for field in SCORE_FIELDS], dtype=float) @ WEIGHT_VECTOR)
 
         return TenantScore(
             total_score=round(total_score, 1),
@@ -319,6 +1200,156 @@ Return ONLY this JSON:
         )
 
 
+class EvaluatorPool:
+    """Long-lived async pool for bulk runs (e.g. a whole inbox)
+
+    Concurrency is bounded by a semaphore and the request rate by a token bucket
+    sized to the per-minute quota (by default the process-wide RATE_LIMITER). The Gemini
+    client is shared by all AIEvaluator instances, so its connections stay warm across
+    submissions. The semaphore belongs to the event loop the pool is first used on.
+    """
+
+    def __init__(self, evaluator: Optional[AIEvaluator] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 concurrency: int = API_CONFIG['concurrency']):
+        self.evaluator = evaluator or AIEvaluator()
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+
+    async def submit(self, email_data: Union[Dict, NormalizedEmail]) -> TenantScore:
+        """Evaluate one candidate within the pool's concurrency and rate limits"""
+        async with self.semaphore:
+            return await self.evaluator.evaluate_candidate_async(email_data, rate_limiter=self.rate_limiter)
+
+    async def evaluate_all(self, emails: List[Dict]) -> List[TenantScore]:
+        """Submit every email and wait for all scores (results keep input order)"""
+        return await asyncio.gather(*[self.submit(email) for email in emails])
+
+
+class AsyncEvaluatorServer:
+    """Micro-batching front end for streaming ingestion (emails arriving one by one)
+
+    submit() scores what it can locally (pre-filter, caches, confident local score) and
+    queues the rest. A collector task sends queued applicants as one batched prompt as
+    soon as max_batch of them are waiting or max_wait seconds have passed since the first,
+    so callers never wait long for a batch to fill. Several batches can be in flight,
+    bounded like EvaluatorPool by a semaphore and a token bucket.
+    """
+
+    def __init__(self, evaluator: Optional[AIEvaluator] = None,
+                 max_batch: int = API_CONFIG['batch_size'],
+                 max_wait: float = API_CONFIG['micro_batch_wait_seconds'],
+                 rate_limiter: Optional[TokenBucket] = None,
+                 concurrency: int = API_CONFIG['concurrency']):
+        self.evaluator = evaluator or AIEvaluator()
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.collector: Optional[asyncio.Task] = None
+        self.batch: List[Tuple[NormalizedEmail, asyncio.Future]] = []  # Being filled by the collector
+        self.in_flight = set()
+
+    async def submit(self, email_data: Union[Dict, NormalizedEmail]) -> TenantScore:
+        """Evaluate one candidate, sharing a Gemini call with other recent submissions"""
+        normalized, results, pending = self.evaluator.triage([email_data])
+        if not pending:
+            return results[0]
+
+        if self.collector is None:
+            self.collector = asyncio.create_task(self.collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((normalized[0], future))
+        return await future
+
+    async def collect(self):
+        """Group queued applicants into batches and dispatch them until closed"""
+        loop = asyncio.get_running_loop()
+        while True:
+            self.batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(self.batch) < self.max_batch:
+                try:
+                    self.batch.append(await asyncio.wait_for(self.queue.get(), deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+
+            self.send(self.batch)
+            self.batch = []
+
+    def send(self, batch: List[Tuple[NormalizedEmail, asyncio.Future]]):
+        """Start scoring a batch in the background"""
+        task = asyncio.create_task(self.dispatch(batch))
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
+
+    async def dispatch(self, batch: List[Tuple[NormalizedEmail, asyncio.Future]]):
+        """Score one batch and hand every caller its result"""
+        try:
+            async with self.semaphore:
+                scores = await self.evaluator.evaluate_batch_async([email for email, _ in batch],
+                                                                   rate_limiter=self.rate_limiter)
+        except Exception as e:
+            scores = [self.evaluator.error_score(e)] * len(batch)
+
+        for (_, future), score in zip(batch, scores):
+            if not future.done():
+                future.set_result(score)
+
+    async def close(self):
+        """Stop the collector, dispatch everything still waiting and let all batches finish"""
+        if self.collector is not None:
+            self.collector.cancel()
+            await asyncio.gather(self.collector, return_exceptions=True)
+            self.collector = None
+
+        # The collector's unfinished batch and the queue still hold callers' futures
+        waiting, self.batch = self.batch, []
+        while not self.queue.empty():
+            waiting.append(self.queue.get_nowait())
+        for start in range(0, len(waiting), self.max_batch):
+            self.send(waiting[start:start + self.max_batch])
+
+        await asyncio.gather(*self.in_flight)
+
+
+# Evaluator of a ProcessPoolExecutor worker, created once by init_worker
+_WORKER_EVALUATOR: Optional[AIEvaluator] = None
+
+
+def init_worker():
+    """Pool initializer: configure Gemini and load the caches once per worker process"""
+    global _WORKER_EVALUATOR
+    _WORKER_EVALUATOR = AIEvaluator()
+
+
+def evaluate_chunk(emails: List[Dict]) -> List[TenantScore]:
+    """Worker task: score one slice of the emails with batched prompts"""
+    scores = _WORKER_EVALUATOR.evaluate_candidates_batched(emails)
+    # Pool workers exit without running atexit handlers, so save the semantic cache here
+    if _WORKER_EVALUATOR.semantic_cache is not None:
+        _WORKER_EVALUATOR.semantic_cache.save()
+    return scores
+
+
+def evaluate_many_mp(emails: List[Dict], workers: Optional[int] = None) -> List[TenantScore]:
+    """Evaluate emails across processes, for runs where local pre/post-processing is CPU-bound
+
+    The emails are split into one contiguous slice per worker; results keep input order.
+    """
+    if not emails:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, len(emails))
+    size = -(-len(emails) // workers)
+    chunks = [emails[i:i + size] for i in range(0, len(emails), size)]
+
+    with ProcessPoolExecutor(max_workers=len(chunks), initializer=init_worker) as pool:
+        return [score for scores in pool.map(evaluate_chunk, chunks) for score in scores]
+
+
 # Test function
 def test_ai_evaluator():
     """Test the AI evaluator with your priorities"""
@@ -358,17 +1389,23 @@ Anna
     evaluator = AIEvaluator()
     score = evaluator.evaluate_candidate(sample_email)
 
-    print(f"\n📊 Evaluation Results (YOUR Priorities):")
-    print(f"🏆 Total Score: {score.total_score}/100")
-    print(f"⏰ Timing Alignment (35%): {score.timing_alignment}/100")
-    print(f"💰 Financial Capability (25%): {score.financial_capability}/100")
-    print(f"🤝 Trustworthiness (20%): {score.trustworthiness}/100")
-    print(f"🪑 Furniture Acceptance (15%): {score.furniture_acceptance}/100")
-    print(f"✍️ Personalization (5%): {score.personalization}/100")
-    print(f"🎁 Bonus Points: {score.bonus_points}")
-    print(f"🚩 Red Flags: {score.red_flags}")
-    print(f"💭 Reasoning: {score.reasoning}")
+    # One write for the whole report instead of a print per line
+    lines = [
+        f"\n📊 Evaluation Results (YOUR Priorities):\n",
+        f"🏆 Total Score: {score.total_score}/100\n",
+        f"⏰ Timing Alignment (35%): {score.timing_alignment}/100\n",
+        f"💰 Financial Capability (25%): {score.financial_capability}/100\n",
+        f"🤝 Trustworthiness (20%): {score.trustworthiness}/100\n",
+        f"🪑 Furniture Acceptance (15%): {score.furniture_acceptance}/100\n",
+        f"✍️ Personalization (5%): {score.personalization}/100\n",
+        f"🎁 Bonus Points: {score.bonus_points}\n",
+        f"🚩 Red Flags: {score.red_flags}\n",
+        f"💭 Reasoning: {score.reasoning}\n",
+    ]
+    sys.stdout.write("".join(lines))
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
+    setup_logging()
     test_ai_evaluator()
\ No newline at end of file
@@ -1,5 +1,7 @@
 # config.py
 
+from types import MappingProxyType
+
 # Rental Property Details
 RENTAL_INFO = {
     "address": "Jutastraße 11, 80636 München Neuhausen-Nymphenburg",
@@ -18,6 +20,7 @@ RENTAL_INFO = {
 # Email Configuration
 EMAIL_CONFIG = {
     "check_interval_minutes": 15,
+    "max_check_interval_minutes": 240,  # Idle checks back off (doubling) up to this
     "max_emails_per_check": 50
 }
 
@@ -38,6 +41,25 @@ EVALUATION_KEYWORDS = {
         "befristet", "ab september", "bis märz", "from september", "until march",
         "exactly 7 months", "genau 7 monate", "september bis märz"
     ],
+    # Regular expressions for explicit requests to rent longer, matched as whole words. A hit
+    # skips Gemini, so only requests count - not ages ("21 years old") or the past ("I spent one year")
+    "timing_rejects": [
+        r"(?:stay|rent|sublet|need|want|looking for|searching for)\s+(?:\w+\s+){0,4}?for\s+(?:at least\s+)?"
+        r"(?:a|one|1|two|2)\s+(?:full\s+)?years?",
+        r"(?:stay|rent|sublet|need|want|looking for|searching for)\s+(?:\w+\s+){0,4}?for\s+(?:at least\s+)?12\s+months",
+        r"(?:suche|brauche|miete|möchte|will)\s+(?:\w+\s+){0,4}?(?:für|auf)\s+(?:mindestens\s+)?"
+        r"(?:ein|einem|1|zwei|2)\s+(?:ganzes\s+)?jahre?n?",
+        r"(?:für|auf)\s+(?:mindestens\s+)?(?:ein|einem|1|zwei|2)\s+(?:ganzes\s+)?jahre?n?\s+(?:\w+\s+){0,2}?"
+        r"(?:mieten|bleiben|wohnen|untermieten)",
+        r"(?:suche|brauche|miete|möchte|will)\s+(?:\w+\s+){0,4}?(?:für|auf)\s+(?:mindestens\s+)?12\s+monate?n?",
+        r"(?:looking for|searching for|want|need|prefer)\s+(?:a\s+|an\s+)?(?:long[\s-]term|permanent)",
+        r"(?:suche|brauche|möchte)\s+(?:\w+\s+){0,2}?(?:langfristig|dauerhaft)",
+        r"(?:langfristig|dauerhaft)\s+(?:\w+\s+){0,2}?(?:mieten|wohnen|bleiben)"
+    ],
+    "timing_longer": [
+        "mehrere jahre", "several years", "for years", "jahrelang", "unbegrenzt", "unlimited",
+        "open-ended", "so lange wie möglich", "as long as possible", "für immer", "forever"
+    ],
     "timing_flexible": [
         "flexible", "länger möglich", "can extend", "shorter also ok", "kürzere zeit"
     ],
@@ -59,6 +81,12 @@ EVALUATION_KEYWORDS = {
         "deine möbel", "your furniture", "existing furniture", "vorhandene einrichtung",
         "übernehme alles", "take everything", "nothing to buy", "nichts kaufen"
     ],
+    # Regular expressions for wanting to bring or swap furniture (quick reject, whole words)
+    "furniture_rejects": [
+        r"(?:bring|take|move in with)\s+(?:\w+\s+){0,2}?furniture", r"own furniture",
+        r"(?:change|replace)\s+(?:the\s+)?furniture", r"eigenen?\s+möbel",
+        r"möbel\s+(?:\w+\s+){0,2}?(?:mitbringen|ändern|austauschen)"
+    ],
     "furniture_problems": [
         "eigene möbel", "own furniture", "bring furniture", "möbel mitbringen",
         "new furniture", "neue möbel", "change furniture", "möbel ändern"
@@ -114,7 +142,62 @@ SECRETARY_ALGORITHM = {
 # API Configuration
 API_CONFIG = {
     "gemini_model": "gemini-2.5-flash",
-    "max_tokens": 800,
+    "body_tokens": 400,  # Email body budget per applicant in the prompt
+    "max_tokens": 256,  # Fits the schema-constrained JSON reply (~150 tokens)
     "temperature": 0.1,  # Lower for more consistent scoring
-    "timeout_seconds": 30
-}
\ No newline at end of file
+    "timeout_seconds": 30,
+    # Cache the static prompt prefix server-side when the SDK supports it. The prefix is a few hundred
+    # tokens, below Gemini's minimum for cached content, so this only pays off with a longer prompt
+    "context_caching": False,
+    "context_cache_min_tokens": 1024,  # Smallest prefix Gemini accepts as cached content
+    "context_cache_ttl_seconds": 3600,
+    "context_cache_refresh_seconds": 300,  # Extend the cached prefix when less than this much TTL is left
+    "concurrency": 20,  # Max parallel Gemini requests when evaluating a batch
+    "requests_per_minute": 500,  # Gemini quota of the process, enforced by one shared token bucket
+    "batch_size": 10,  # Applicants scored per prompt in batched evaluation
+    "batch_item_tokens": 256,  # Output token budget per applicant in a batched prompt
+    "micro_batch_wait_seconds": 0.2,  # Longest AsyncEvaluatorServer waits for a batch to fill
+    "batch_mode_poll_seconds": 30  # Status polling interval for Gemini Batch Mode jobs
+}
+
+# Response Cache Settings
+CACHE_CONFIG = {
+    "enabled": True,
+    "backend": "sqlite",  # "sqlite" (persistent) or "memory" (per process)
+    "path": "~/.cache/ai_evaluator/cache.sqlite",
+    "ttl_seconds": 86400,
+    "max_temperature": 0.1,  # Only cache replies sampled at or below this temperature
+    "model_file": "~/.cache/ai_evaluator/model.json"  # Last working Gemini model
+}
+
+# Semantic Cache Settings (needs sentence-transformers + faiss-cpu from requirements-optional.txt)
+SEMANTIC_CACHE_CONFIG = {
+    "enabled": False,  # Off by default: loading the embedding model (and its first download) is slow
+    "model": "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+    "threshold": 0.92,  # Cosine similarity above which a previous score is reused
+    "body_chars": 600,
+    "index_path": "~/.cache/ai_evaluator/semantic.faiss",
+    "results_path": "~/.cache/ai_evaluator/semantic.json",  # Scores parallel to the index rows
+    "save_every": 20  # Additions between saves (the rest is saved at exit)
+}
+
+# Pre-filter: obvious rejects are scored locally, without a Gemini call
+QUICK_REJECT = {
+    "enabled": True,
+    "min_body_chars": 80  # Shorter applications are treated as empty
+}
+
+# Local Keyword Scoring (fast path before Gemini)
+LOCAL_SCORING = {
+    # Keyword hits are too coarse to replace or adjust the model (ordinary applications hit a
+    # keyword for every criterion), so both uses are off by default
+    "fast_path_enabled": False,  # Skip Gemini when the keywords decide enough criteria
+    "confidence_threshold": 1.0,  # Share of conflict-free criteria the fast path needs
+    "blend_enabled": False,  # Average Gemini's criterion scores with the keyword scores
+    "prior_weight": 0.2  # Weight of the keyword scores in that average
+}
+
+# Rental facts, weights and keywords are shared by every module - expose them read-only
+RENTAL_INFO = MappingProxyType(RENTAL_INFO)
+SCORING_WEIGHTS = MappingProxyType(SCORING_WEIGHTS)
+EVALUATION_KEYWORDS = MappingProxyType({category: tuple(words) for category, words in EVALUATION_KEYWORDS.items()})
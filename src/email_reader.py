@@ -1,31 +1,75 @@
 # email_reader.py
 
 import os
+import re
+import html
 import base64
 import json
+import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional
 
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
 from config import EMAIL_CONFIG
+from log_setup import setup_logging
+
+logger = logging.getLogger(__name__)
 
 # Gmail API scopes
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# Partial response mask for messages.get: top-level headers and body, no labels or snippet.
+# Nested parts are requested whole - a depth-limited projection drops the text of deeply
+# nested messages (forwards, multipart/mixed -> alternative -> related)
+MESSAGE_FIELDS = "id,payload(headers(name,value),mimeType,body/data,parts)"
+
+# Calls per batch HTTP request: Gmail allows 100 but rate-limits (429) batches above 50
+GMAIL_BATCH_SIZE = 50
+
+# Fallback HTML stripping when selectolax is not installed
+INVISIBLE_HTML_RE = re.compile(r'<(script|style|head)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(markup: str) -> str:
+    """Visible text of an HTML body on one line, so Gemini isn't billed for markup"""
+    if HTMLParser is not None:
+        tree = HTMLParser(markup)
+        tree.strip_tags(['script', 'style', 'head'])
+        text = (tree.body or tree.root).text(separator=' ', strip=True)
+    else:
+        text = html.unescape(HTML_TAG_RE.sub(' ', INVISIBLE_HTML_RE.sub(' ', markup)))
+    return WHITESPACE_RE.sub(' ', text).strip()
+
 
 class EmailReader:
+    # Gmail handles shared by every reader in the process (set up once by setup_gmail_api)
+    service = None
+    credentials = None
+
     def __init__(self):
-        self.service = None
-        self.credentials = None
         self.setup_gmail_api()
 
-    def setup_gmail_api(self):
-        """Set up Gmail API authentication"""
+    @classmethod
+    def setup_gmail_api(cls):
+        """Set up Gmail API authentication once per process"""
+        if cls.service is not None:
+            return
+
         creds = None
 
         # Load existing credentials
@@ -46,112 +90,169 @@ class EmailReader:
             with open('token.json', 'w') as token:
                 token.write(creds.to_json())
 
-        self.credentials = creds
-        self.service = build('gmail', 'v1', credentials=creds)
-        print("✅ Gmail API authenticated successfully")
+        cls.credentials = creds
+        # Use the discovery document bundled with the client library instead of fetching it
+        cls.service = build('gmail', 'v1', credentials=creds, static_discovery=True)
+        logger.info("✅ Gmail API authenticated successfully")
 
     def get_recent_emails(self, days_back: int = 7) -> List[Dict]:
         """Get all recent emails (assuming all are rental applications)"""
+        email_data = []
         try:
-            # Calculate date range (add 1 day to end_date to include today)
-            end_date = datetime.now() + timedelta(days=1)
-            start_date = end_date - timedelta(days=days_back + 1)
+            for page in self.iter_recent_emails(days_back, max_emails=EMAIL_CONFIG['max_emails_per_check']):
+                email_data.extend(page)
+        except HttpError as error:
+            logger.error("❌ An error occurred: %s", error)
 
-            # Simple query - just get all emails in date range
-            query = f"after:{start_date.strftime('%Y/%m/%d')}"
-            print(f"🔍 Getting all emails from last {days_back} days...")
-            print(f"🔍 Query: {query}")
+        return email_data
 
-            # Search for emails
-            results = self.service.users().messages().list(
-                userId='me',
-                q=query,
-                maxResults=50
-            ).execute()
+    def iter_recent_emails(self, days_back: int = 7, page_size: int = 100,
+                           max_emails: Optional[int] = None) -> Iterator[List[Dict]]:
+        """Yield recent emails one result page at a time
 
-            messages = results.get('messages', [])
-            print(f"📧 Found {len(messages)} emails to process")
+        The next page is listed in a background thread while the details of the current
+        page are fetched, so the list round-trip hides behind the batch request.
+        """
+        # Calculate date range (add 1 day to end_date to include today)
+        end_date = datetime.now() + timedelta(days=1)
+        start_date = end_date - timedelta(days=days_back + 1)
 
-            # Get detailed email data
-            email_data = []
-            for message in messages:
-                email_details = self.get_email_details(message['id'])
-                if email_details:
-                    email_data.append(email_details)
+        # Simple query - just get all emails in date range
+        query = f"after:{start_date.strftime('%Y/%m/%d')}"
+        logger.info("🔍 Getting all emails from last %d days...", days_back)
+        logger.info("🔍 Query: %s", query)
 
-            return email_data
+        remaining = max_emails  # None: no limit
+        messages = self.service.users().messages()
+        # httplib2 connections are not thread-safe, so the list thread gets its own
+        list_http = AuthorizedHttp(self.credentials, http=httplib2.Http())
 
-        except HttpError as error:
-            print(f"❌ An error occurred: {error}")
-            return []
+        def list_page(page_token: Optional[str]) -> Dict:
+            return messages.list(
+                userId='me',
+                q=query,
+                maxResults=page_size if remaining is None else min(page_size, remaining),
+                pageToken=page_token
+            ).execute(http=list_http)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            page = list_page(None)
+            while True:
+                message_ids = [message['id'] for message in page.get('messages', [])]
+                if remaining is not None:
+                    message_ids = message_ids[:remaining]
+                    remaining -= len(message_ids)
+                logger.info("📧 Found %d emails to process", len(message_ids))
+
+                next_token = page.get('nextPageToken')
+                more = next_token and (remaining is None or remaining > 0)
+                next_page = executor.submit(list_page, next_token) if more else None
+
+                yield self.get_emails_details(message_ids)
+
+                if next_page is None:
+                    return
+                page = next_page.result()
+
+    def get_emails_details(self, message_ids: List[str]) -> List[Dict]:
+        """Get detailed information for many emails in one batch HTTP request (keeps input order)"""
+        fetched = {}
+
+        def collect(request_id, message, error):
+            if error is not None:
+                logger.error("❌ Error getting email details: %s", error)
+            else:
+                fetched[request_id] = message
+
+        for start in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=collect)
+            for message_id in message_ids[start:start + GMAIL_BATCH_SIZE]:
+                batch.add(self.get_message_request(message_id), request_id=message_id)
+            batch.execute()
+
+        return [self.parse_message(fetched[message_id]) for message_id in message_ids if message_id in fetched]
 
     def get_email_details(self, message_id: str) -> Optional[Dict]:
         """Get detailed information from a specific email"""
         try:
-            # Get the email
-            message = self.service.users().messages().get(
-                userId='me',
-                id=message_id,
-                format='full'
-            ).execute()
-
-            # Extract headers
-            headers = message['payload'].get('headers', [])
-            subject = self.get_header_value(headers, 'Subject')
-            sender = self.get_header_value(headers, 'From')
-            date_str = self.get_header_value(headers, 'Date')
-
-            # Extract email body
-            body = self.extract_email_body(message['payload'])
-
-            # Parse date
-            email_date = self.parse_email_date(date_str)
-
-            email_data = {
-                'id': message_id,
-                'subject': subject or 'No Subject',
-                'sender': sender or 'Unknown Sender',
-                'date': email_date,
-                'body': body or 'No Body Content',
-                'raw_date': date_str
-            }
-
-            print(f"📨 Processed email from: {email_data['sender']}")
-            return email_data
-
+            return self.parse_message(self.get_message_request(message_id).execute())
         except HttpError as error:
-            print(f"❌ Error getting email details: {error}")
+            logger.error("❌ Error getting email details: %s", error)
             return None
 
-    def get_header_value(self, headers: List[Dict], name: str) -> Optional[str]:
-        """Extract header value by name"""
-        for header in headers:
-            if header['name'].lower() == name.lower():
-                return header['value']
-        return None
+    def get_message_request(self, message_id: str):
+        """Unexecuted messages.get request for one email"""
+        return self.service.users().messages().get(
+            userId='me',
+            id=message_id,
+            format='full',
+            fields=MESSAGE_FIELDS
+        )
+
+    def parse_message(self, message: Dict) -> Dict:
+        """Turn a Gmail API message resource into our email dict"""
+        message_id = message['id']
+
+        # Extract headers
+        headers = self.get_header_values(message['payload'].get('headers', []))
+        subject = headers.get('subject')
+        sender = headers.get('from')
+        date_str = headers.get('date')
+
+        # Extract email body
+        body = self.extract_email_body(message['payload'])
+
+        # Parse date
+        email_date = self.parse_email_date(date_str)
+
+        email_data = {
+            'id': message_id,
+            'subject': subject or 'No Subject',
+            'sender': sender or 'Unknown Sender',
+            'date': email_date,
+            'body': body or 'No Body Content',
+            'raw_date': date_str
+        }
+
+        logger.info("📨 Processed email from: %s", email_data['sender'])
+        return email_data
+
+    def get_header_values(self, headers: List[Dict]) -> Dict[str, str]:
+        """Map lowercased header names to values (the first occurrence wins, as in a linear search)"""
+        return {header['name'].lower(): header['value'] for header in reversed(headers)}
 
     def extract_email_body(self, payload: Dict) -> str:
-        """Extract text content from email payload"""
-        body = ""
-
-        if 'parts' in payload:
-            # Multi-part email
-            for part in payload['parts']:
-                if part['mimeType'] == 'text/plain':
-                    data = part['body']['data']
-                    body += base64.urlsafe_b64decode(data).decode('utf-8')
-                elif part['mimeType'] == 'text/html':
-                    # Fallback to HTML if no plain text
-                    if not body:
-                        data = part['body']['data']
-                        body += base64.urlsafe_b64decode(data).decode('utf-8')
-        else:
-            # Single part email
-            if payload['mimeType'] == 'text/plain':
-                data = payload['body']['data']
-                body = base64.urlsafe_b64decode(data).decode('utf-8')
-
-        return body.strip()
+        """Extract text content from email payload (plain text, falling back to HTML converted to text)
+
+        Walks nested multiparts (e.g. alternative inside mixed) with an explicit stack,
+        in document order. Parts are only collected while scanning; just the chosen
+        ones are decoded.
+        """
+        plain_parts = []
+        html_part = None
+        stack = [payload]
+
+        while stack:
+            part = stack.pop()
+            if 'parts' in part:
+                stack.extend(reversed(part['parts']))
+                continue
+
+            data = part.get('body', {}).get('data')
+            if not data:
+                continue
+            if part['mimeType'] == 'text/plain':
+                plain_parts.append(data)
+            elif part['mimeType'] == 'text/html' and html_part is None:
+                html_part = data
+
+        if not plain_parts:
+            return html_to_text(self.decode_part(html_part)) if html_part else ""
+        return "".join(self.decode_part(data) for data in plain_parts).strip()
+
+    def decode_part(self, data: str) -> str:
+        """Decode a part's base64url body data"""
+        return base64.urlsafe_b64decode(data).decode('utf-8', errors='replace')
 
     def parse_email_date(self, date_str: str) -> datetime:
         """Parse email date string to datetime object"""
@@ -182,4 +283,5 @@ def test_email_reader():
 
 
 if __name__ == "__main__":
+    setup_logging()
     test_email_reader()
\ No newline at end of file
@@ -0,0 +1,73 @@
+# gemini_batch.py
+
+import os
+import time
+import logging
+import tempfile
+from typing import Dict
+
+import fast_json
+from config import API_CONFIG
+
+try:
+    from google import genai as google_genai
+except ImportError:
+    google_genai = None
+
+logger = logging.getLogger(__name__)
+
+# Terminal states of a Gemini batch job
+FINISHED_STATES = {"JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED"}
+
+
+def batch_mode_available() -> bool:
+    """Batch Mode needs the newer google-genai client next to google-generativeai"""
+    return google_genai is not None
+
+
+def run_batch_job(requests: Dict[str, Dict], model_name: str,
+                  poll_seconds: float = API_CONFIG['batch_mode_poll_seconds']) -> Dict[str, str]:
+    """Run GenerateContent requests through the Gemini Batch API and wait for the result
+
+    requests maps a caller-chosen key to a GenerateContentRequest body (REST JSON shape).
+    Returns {key: response text} for every request that succeeded; failed or missing
+    entries are simply absent. Jobs are asynchronous on Google's side and can take a
+    while, so this is meant for offline bulk runs.
+    """
+    client = google_genai.Client(api_key=os.getenv('GEMINI_API_KEY'))
+
+    with tempfile.NamedTemporaryFile('wb', suffix='.jsonl', delete=False) as f:
+        for key, request in requests.items():
+            f.write(fast_json.dumps({"key": key, "request": request}) + b"\n")
+        path = f.name
+
+    try:
+        uploaded = client.files.upload(file=path, config={'mime_type': 'jsonl'})
+    finally:
+        os.remove(path)
+
+    job = client.batches.create(model=model_name, src=uploaded.name,
+                                config={'display_name': f"tenant-evaluation-{int(time.time())}"})
+    logger.info("📦 Submitted batch job %s with %d requests", job.name, len(requests))
+
+    while job.state.name not in FINISHED_STATES:
+        time.sleep(poll_seconds)
+        job = client.batches.get(name=job.name)
+        logger.debug("Batch job %s: %s", job.name, job.state.name)
+
+    if job.state.name != "JOB_STATE_SUCCEEDED":
+        logger.error("❌ Batch job %s ended in %s", job.name, job.state.name)
+        return {}
+
+    results = {}
+    for line in client.files.download(file=job.dest.file_name).splitlines():
+        if not line.strip():
+            continue
+        entry = fast_json.loads(line)
+        try:
+            results[entry['key']] = entry['response']['candidates'][0]['content']['parts'][0]['text']
+        except (KeyError, IndexError, TypeError):
+            logger.warning("⚠️  Batch request %s failed: %s", entry.get('key'), entry.get('error'))
+
+    logger.info("📦 Batch job %s finished: %d/%d responses", job.name, len(results), len(requests))
+    return results
@@ -0,0 +1,26 @@
+# log_setup.py
+
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener
+
+
+def setup_logging(level: int = logging.INFO, fmt: str = "%(message)s") -> QueueListener:
+    """Send log records through a queue so a background thread does the terminal I/O
+
+    Logging calls on the per-email path then only enqueue the record. The listener
+    drains the queue and stops at interpreter exit.
+    """
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(fmt))
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+    return listener
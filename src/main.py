@@ -1,103 +1,281 @@
 # main.py
 
 import os
+import sys
+import atexit
 import json
+import time
+import heapq
+from array import array
 from datetime import datetime
-from typing import Dict, List
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
+import numpy as np
 from dotenv import load_dotenv
 
-from email_reader import EmailReader
-from ai_evaluator import AIEvaluator, TenantScore
-from config import RENTAL_INFO
+import fast_json
+from config import RENTAL_INFO, EMAIL_CONFIG
+from log_setup import setup_logging
+
+# The Gmail and Gemini client libraries are slow to import, so the modules wrapping them
+# are only imported once a SubtenantFinder is created (after main()'s setup checks)
+if TYPE_CHECKING:
+    from ai_evaluator import TenantScore
 
 # Load environment variables
 load_dotenv()
 
+# Columns of SubtenantFinder.get_score_table (red_flags holds the number of flags)
+SCORE_TABLE_COLUMNS = ("total", "timing_alignment", "financial_capability", "furniture_acceptance", "red_flags")
+TOTAL, TIMING, FINANCIAL, FURNITURE, RED_FLAGS = range(len(SCORE_TABLE_COLUMNS))
+
+# Stored candidate["score"] keys and the TenantScore fields they are read from (in one C call)
+SCORE_KEYS = ("total", "timing_alignment", "financial_capability", "trustworthiness",
+              "furniture_acceptance", "personalization", "bonus_points")
+get_score_values = attrgetter("total_score", "timing_alignment", "financial_capability", "trustworthiness",
+                              "furniture_acceptance", "personalization", "bonus_points")
+
+# Best candidates tracked incrementally for the dashboard
+TOP_CANDIDATES_KEPT = 10
+
+# Dashboard text that only depends on the config, built once at import
+RENTAL_SUMMARY_LINE = (f"💰 Rent: {RENTAL_INFO['total_monthly']}€/month + {RENTAL_INFO['deposit']}€ deposit\n"
+                       f"📅 Period: {RENTAL_INFO['start_date']} to {RENTAL_INFO['end_date']} (EXACT 7 months)\n"
+                       f"🪑 Furnished: Must keep your furniture setup")
+PRIORITY_WEIGHTS_BLOCK = "\n".join([
+    "📋 YOUR PRIORITY WEIGHTS:",
+    "   ⏰ Timing Alignment: 35% (EXACT Sept 2025 - March 2026)",
+    "   💰 Financial Capability: 25% (636€/month + 1608€ deposit)",
+    "   🤝 Trustworthiness: 20% (reliable, references, stable)",
+    "   🪑 Furniture Acceptance: 15% (keep your setup unchanged)",
+    "   ✍️ Personalization: 5% (thoughtful, non-generic application)",
+    "\n💡 Green = Excellent (80+) | Yellow = Good (65-79) | Red = Issues (<65)",
+])
+
+
+def status_emoji(total: float) -> str:
+    """Traffic light for a total score (see the legend in PRIORITY_WEIGHTS_BLOCK)"""
+    return "🟢" if total >= 80 else "🟡" if total >= 65 else "🔴"
+
+
+def truncate(text: str, limit: int = 500) -> str:
+    """First limit characters of text, with "..." when something was cut"""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
 
 class SubtenantFinder:
     def __init__(self):
+        from email_reader import EmailReader
+        from ai_evaluator import AIEvaluator
+
         self.email_reader = EmailReader()
         self.ai_evaluator = AIEvaluator()
-        self.candidates_file = "data/candidates.json"
+        self.candidates_stream = "data/candidates.ndjson"  # One candidate per line, append-only
+        self.metadata_file = "data/metadata.json"
+        self.legacy_candidates_file = "data/candidates.json"  # Single-document format, migrated on save
         self.candidates_data = self.load_candidates()
+        # Email ids already in candidates_data, for O(1) duplicate checks
+        self.processed_ids = {c["email_id"] for c in self.candidates_data["candidates"]}
+        # Score columns of all candidates (one array per SCORE_TABLE_COLUMNS entry), grown on append
+        self.score_columns = tuple(array('d') for _ in SCORE_TABLE_COLUMNS)
+        for candidate in self.candidates_data["candidates"]:
+            self.append_score_row(candidate)
+        # The columns as one NumPy table, built on demand and reset when candidates are added
+        self.score_table = None
+        # Metadata changes not yet written; flushed once per process_new_emails call and at exit
+        self.metadata_dirty = False
+        atexit.register(self.flush_metadata)
+        # Min-heap of (total, -index) for the TOP_CANDIDATES_KEPT best candidates, kept up to date on append
+        self.top_heap = None
+        # Minutes until run_forever checks again; doubles while no new emails arrive
+        self.poll_interval_minutes = EMAIL_CONFIG['check_interval_minutes']
 
     def load_candidates(self) -> Dict:
-        """Load existing candidates data from JSON file"""
-        if os.path.exists(self.candidates_file):
+        """Load existing candidates (NDJSON stream) and metadata
+
+        Sets saved_count to the number of candidates already on disk, so
+        save_candidates only appends what was added since.
+        """
+        if not os.path.exists(self.candidates_stream) and os.path.exists(self.legacy_candidates_file):
+            return self.load_legacy_candidates()
+
+        candidates = []
+        # A last line without newline (crash mid-write) must not run into the next appended one
+        self.stream_needs_newline = False
+        if os.path.exists(self.candidates_stream):
+            with open(self.candidates_stream, 'rb') as f:
+                for line in f:
+                    self.stream_needs_newline = not line.endswith(b"\n")
+                    if not line.strip():
+                        continue
+                    try:
+                        candidates.append(fast_json.loads(line))
+                    except json.JSONDecodeError:
+                        # e.g. a line cut short by a crash mid-write
+                        print("⚠️  Warning: Skipping invalid line in candidates file")
+        self.saved_count = len(candidates)
+
+        metadata = None
+        if os.path.exists(self.metadata_file):
             try:
-                with open(self.candidates_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.metadata_file, 'rb') as f:
+                    metadata = fast_json.loads(f.read())
             except json.JSONDecodeError:
-                print("⚠️  Warning: Invalid JSON in candidates file, starting fresh")
-
+                print("⚠️  Warning: Invalid JSON in metadata file, starting fresh")
+
+        return {"candidates": candidates, "metadata": metadata or self.new_metadata()}
+
+    def load_legacy_candidates(self) -> Dict:
+        """Load data saved as one JSON document; everything is written to the stream on the next save"""
+        self.saved_count = 0
+        self.stream_needs_newline = False
+        try:
+            with open(self.legacy_candidates_file, 'rb') as f:
+                return fast_json.loads(f.read())
+        except json.JSONDecodeError:
+            print("⚠️  Warning: Invalid JSON in candidates file, starting fresh")
+            return {"candidates": [], "metadata": self.new_metadata()}
+
+    def new_metadata(self) -> Dict:
+        """Metadata for an empty candidates store"""
         return {
-            "candidates": [],
-            "metadata": {
-                "created": datetime.now().isoformat(),
-                "last_updated": datetime.now().isoformat(),
-                "total_processed": 0
-            }
+            "created": datetime.now().isoformat(),
+            "last_updated": datetime.now().isoformat(),
+            "total_processed": 0
         }
 
-    def save_candidates(self):
-        """Save candidates data to JSON file"""
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(self.candidates_file), exist_ok=True)
+    def save_candidates(self, now_iso: Optional[str] = None, flush: bool = True):
+        """Append unsaved candidates to the NDJSON stream and update the metadata
 
-        self.candidates_data["metadata"]["last_updated"] = datetime.now().isoformat()
+        now_iso is stored as last_updated (defaults to the current time). With flush=False
+        the metadata file is only rewritten by the next flush_metadata call.
+        """
+        # Ensure data directory exists
+        os.makedirs(os.path.dirname(self.candidates_stream), exist_ok=True)
+
+        new_candidates = self.candidates_data["candidates"][self.saved_count:]
+        with open(self.candidates_stream, 'ab') as f:
+            if self.stream_needs_newline:
+                f.write(b"\n")
+                self.stream_needs_newline = False
+            f.writelines(fast_json.dumps(candidate) + b"\n" for candidate in new_candidates)
+            f.flush()
+            os.fsync(f.fileno())
+        self.saved_count += len(new_candidates)
+
+        self.candidates_data["metadata"]["last_updated"] = now_iso or datetime.now().isoformat()
+        self.metadata_dirty = True
+        if flush:
+            self.flush_metadata()
+
+        print(f"💾 Saved {len(new_candidates)} new candidates to {self.candidates_stream}")
+
+    def flush_metadata(self):
+        """Rewrite the metadata file if it changed since the last write"""
+        if self.metadata_dirty:
+            self.write_atomically(self.metadata_file, fast_json.dumps(self.candidates_data["metadata"]))
+            self.metadata_dirty = False
+
+    def write_atomically(self, path: str, data: bytes):
+        """Replace path with data so a crash mid-write leaves the old file intact"""
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
-        with open(self.candidates_file, 'w', encoding='utf-8') as f:
-            json.dump(self.candidates_data, f, indent=2, ensure_ascii=False, default=str)
+    def process_new_emails(self, days_back: int = 7) -> List[Dict]:
+        """Process new rental application emails
 
-        print(f"💾 Saved candidates data to {self.candidates_file}")
+        Works page by page as a pipeline: while Gemini evaluates one page of emails in a
+        worker thread, the next page is fetched from Gmail and the previous page's
+        candidates are printed and saved.
+        """
+        from googleapiclient.errors import HttpError
 
-    def process_new_emails(self, days_back: int = 7) -> List[Dict]:
-        """Process new rental application emails"""
         print(f"🔍 Looking for new emails in the last {days_back} days...")
 
-        # Get recent emails
-        emails = self.email_reader.get_recent_emails(days_back)
+        found_emails = False
+        new_candidates = []
+        evaluating = None  # (emails, future with their scores) of the page in the worker
 
-        if not emails:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            try:
+                for emails in self.email_reader.iter_recent_emails(
+                        days_back, max_emails=EMAIL_CONFIG['max_emails_per_check']):
+                    found_emails = found_emails or bool(emails)
+                    new_emails = self.filter_new_emails(emails)
+
+                    submitted = None
+                    if new_emails:
+                        # Evaluate with AI using YOUR real priorities (several applicants per Gemini call)
+                        print(f"\n🤖 Evaluating {len(new_emails)} candidates...")
+                        submitted = (new_emails, executor.submit(self.ai_evaluator.evaluate_candidates_batched,
+                                                                 new_emails))
+
+                    if evaluating is not None:
+                        new_candidates.extend(self.record_candidates(evaluating[0], evaluating[1].result()))
+                    evaluating = submitted
+            except HttpError as error:
+                print(f"❌ An error occurred: {error}")
+
+            if evaluating is not None:
+                new_candidates.extend(self.record_candidates(evaluating[0], evaluating[1].result()))
+
+        # Candidates were appended page by page; the metadata is written once per check
+        self.flush_metadata()
+
+        if not found_emails:
             print("📭 No new emails found")
-            return []
+        elif new_candidates:
+            print(f"\n✅ Processed {len(new_candidates)} new candidates")
 
-        new_candidates = []
+        return new_candidates
 
+    def filter_new_emails(self, emails: List[Dict]) -> List[Dict]:
+        """Drop emails we've already processed"""
+        new_emails = []
         for email in emails:
-            # Check if we've already processed this email
             if self.is_email_processed(email['id']):
                 print(f"⏭️  Skipping already processed email: {email['id']}")
                 continue
+            new_emails.append(email)
+        return new_emails
 
-            print(f"\n🤖 Evaluating candidate: {email['sender']}")
-
-            # Evaluate with AI using YOUR real priorities
-            score = self.ai_evaluator.evaluate_candidate(email)
+    def record_candidates(self, emails: List[Dict], scores: List['TenantScore']) -> List[Dict]:
+        """Add evaluated emails as candidates, print them and append them to the store"""
+        # One processing time for the whole batch (also used as the metadata's last_updated)
+        processed_at = datetime.now().isoformat()
+        new_candidates = []
 
+        for email, score in zip(emails, scores):
             # Create candidate record with YOUR priority criteria
             candidate = {
                 "email_id": email['id'],
                 "sender": email['sender'],
                 "subject": email['subject'],
                 "date": email['date'].isoformat() if hasattr(email['date'], 'isoformat') else str(email['date']),
-                "processed_at": datetime.now().isoformat(),
-                "score": {
-                    "total": score.total_score,
-                    "timing_alignment": score.timing_alignment,
-                    "financial_capability": score.financial_capability,
-                    "trustworthiness": score.trustworthiness,
-                    "furniture_acceptance": score.furniture_acceptance,
-                    "personalization": score.personalization,
-                    "bonus_points": score.bonus_points
-                },
+                "processed_at": processed_at,
+                "score": dict(zip(SCORE_KEYS, get_score_values(score))),
                 "reasoning": score.reasoning,
                 "red_flags": score.red_flags,
-                "email_body": email['body'][:500] + "..." if len(email['body']) > 500 else email['body']
+                "email_body": truncate(email['body'])
             }
 
             # Add to candidates
             self.candidates_data["candidates"].append(candidate)
+            self.processed_ids.add(email['id'])
+            self.append_score_row(candidate)
+            self.score_table = None
+            if self.top_heap is not None:
+                self.push_top(len(self.candidates_data["candidates"]) - 1)
             self.candidates_data["metadata"]["total_processed"] += 1
             new_candidates.append(candidate)
 
@@ -106,86 +284,129 @@ class SubtenantFinder:
 
         # Save updated data
         if new_candidates:
-            self.save_candidates()
-            print(f"\n✅ Processed {len(new_candidates)} new candidates")
+            self.save_candidates(processed_at, flush=False)
 
         return new_candidates
 
     def is_email_processed(self, email_id: str) -> bool:
         """Check if an email has already been processed"""
-        for candidate in self.candidates_data["candidates"]:
-            if candidate["email_id"] == email_id:
-                return True
-        return False
+        return email_id in self.processed_ids
 
     def print_candidate_summary(self, candidate: Dict):
         """Print a summary of a candidate's evaluation using YOUR real priorities"""
         score = candidate['score']
-        print(f"📊 Candidate Summary:")
-        print(f"   From: {candidate['sender']}")
-        print(f"   🏆 Total Score: {score['total']}/100")
-        print(f"   ⏰ Timing (35%): {score['timing_alignment']}/100")
-        print(f"   💰 Financial (25%): {score['financial_capability']}/100")
-        print(f"   🤝 Trust (20%): {score['trustworthiness']}/100")
-        print(f"   🪑 Furniture (15%): {score['furniture_acceptance']}/100")
-        print(f"   ✍️ Personal (5%): {score['personalization']}/100")
-        if score.get('bonus_points', 0) > 0:
-            print(f"   🎁 Bonus: +{score['bonus_points']} points")
-        if candidate['red_flags']:
-            print(f"   🚩 Red Flags: {', '.join(candidate['red_flags'])}")
-        print(f"   💭 AI Reasoning: {candidate['reasoning'][:100]}...")
-
-    def get_candidate_rankings(self) -> List[Dict]:
-        """Get all candidates ranked by total score"""
-        candidates = self.candidates_data["candidates"].copy()
-        candidates.sort(key=lambda x: x["score"]["total"], reverse=True)
-        return candidates
+        lines = []
+        lines.append(f"📊 Candidate Summary:")
+        lines.append(f"   From: {candidate['sender']}")
+        lines.append(f"   🏆 Total Score: {score['total']}/100")
+        lines.append(f"   ⏰ Timing (35%): {score['timing_alignment']}/100")
+        lines.append(f"   💰 Financial (25%): {score['financial_capability']}/100")
+        lines.append(f"   🤝 Trust (20%): {score['trustworthiness']}/100")
+        lines.append(f"   🪑 Furniture (15%): {score['furniture_acceptance']}/100")
+        lines.append(f"   ✍️ Personal (5%): {score['personalization']}/100")
+        bonus = score.get('bonus_points', 0)
+        red_flags = candidate['red_flags']
+        if bonus > 0:
+            lines.append(f"   🎁 Bonus: +{bonus} points")
+        if red_flags:
+            lines.append(f"   🚩 Red Flags: {', '.join(red_flags)}")
+        lines.append(f"   💭 AI Reasoning: {candidate['reasoning'][:100]}...")
+        sys.stdout.write("\n".join(lines) + "\n")
+
+    def get_top_candidates(self, k: int) -> List[Dict]:
+        """The k best candidates by total score (ties in arrival order), without a full sort"""
+        candidates = self.candidates_data["candidates"]
+        if k > TOP_CANDIDATES_KEPT:
+            return self.top_by_score(candidates, k)
+
+        if self.top_heap is None:
+            self.top_heap = []
+            for index in range(len(candidates)):
+                self.push_top(index)
+        return [candidates[-neg_index] for _, neg_index in sorted(self.top_heap, reverse=True)[:k]]
+
+    def push_top(self, index: int):
+        """Offer candidate number index to top_heap (on equal totals the earlier candidate stays)"""
+        entry = (self.candidates_data["candidates"][index]["score"]["total"], -index)
+        if len(self.top_heap) < TOP_CANDIDATES_KEPT:
+            heapq.heappush(self.top_heap, entry)
+        else:
+            heapq.heappushpop(self.top_heap, entry)
+
+    def top_by_score(self, candidates: List[Dict], k: int) -> List[Dict]:
+        """The k highest total scores among candidates (ties keep list order, like a stable sort)"""
+        return heapq.nlargest(k, candidates, key=lambda x: x["score"]["total"])
+
+    def append_score_row(self, candidate: Dict):
+        """Add a candidate's scores to the end of score_columns"""
+        score = candidate['score']
+        row = (score['total'], score['timing_alignment'], score['financial_capability'],
+               score['furniture_acceptance'], len(candidate['red_flags']))
+        for column, value in zip(self.score_columns, row):
+            column.append(value)
+
+    def get_score_table(self) -> np.ndarray:
+        """Scores of all candidates (in stored order) as one float array, a row per candidate (see SCORE_TABLE_COLUMNS)"""
+        if self.score_table is None:
+            # Each column is a contiguous buffer, so this is a few memory copies
+            self.score_table = np.column_stack([np.array(column) for column in self.score_columns])
+        return self.score_table
+
+    def select(self, candidates: List[Dict], mask: np.ndarray) -> List[Dict]:
+        """Candidates whose score table row matches mask (in stored order)"""
+        return [candidates[i] for i in np.flatnonzero(mask)]
 
     def show_dashboard(self):
         """Display current dashboard with all candidates using YOUR priorities"""
-        print("\n" + "=" * 70)
-        print("🏠 SUBTENANT FINDER - YOUR PRIORITIES DASHBOARD")
-        print("=" * 70)
+        lines = []
+        lines.append("\n" + "=" * 70)
+        lines.append("🏠 SUBTENANT FINDER - YOUR PRIORITIES DASHBOARD")
+        lines.append("=" * 70)
 
-        candidates = self.get_candidate_rankings()
+        candidates = self.candidates_data["candidates"]
 
         if not candidates:
-            print("📭 No candidates processed yet")
-            print("\n💡 Run the system to start processing emails!")
-            print("   python main.py")
+            lines.append("📭 No candidates processed yet")
+            lines.append("\n💡 Run the system to start processing emails!")
+            lines.append("   python main.py")
+            sys.stdout.write("\n".join(lines) + "\n")
             return
 
-        print(f"📊 Total Candidates: {len(candidates)}")
-        print(f"🏆 Best Score: {candidates[0]['score']['total']}/100")
-        print(f"📈 Average Score: {sum(c['score']['total'] for c in candidates) / len(candidates):.1f}/100")
-        print(f"💰 Rent: {RENTAL_INFO['total_monthly']}€/month + {RENTAL_INFO['deposit']}€ deposit")
-        print(f"📅 Period: {RENTAL_INFO['start_date']} to {RENTAL_INFO['end_date']} (EXACT 7 months)")
-        print(f"🪑 Furnished: Must keep your furniture setup")
+        lines.append(f"📊 Total Candidates: {len(candidates)}")
+        top_candidates = self.get_top_candidates(5)
+        lines.append(f"🏆 Best Score: {top_candidates[0]['score']['total']}/100")
+        lines.append(f"📈 Average Score: {self.get_score_table()[:, TOTAL].mean():.1f}/100")
+        lines.append(RENTAL_SUMMARY_LINE)
 
-        print("\n🏆 TOP CANDIDATES (Based on YOUR Priorities):")
-        print("-" * 70)
+        lines.append("\n🏆 TOP CANDIDATES (Based on YOUR Priorities):")
+        lines.append("-" * 70)
 
-        for i, candidate in enumerate(candidates[:5], 1):  # Show top 5
+        for i, candidate in enumerate(top_candidates, 1):
             score = candidate['score']
-            status_emoji = "🟢" if score['total'] >= 80 else "🟡" if score['total'] >= 65 else "🔴"
-            flags_text = f" 🚩{len(candidate['red_flags'])}" if candidate['red_flags'] else ""
-            bonus_text = f" 🎁+{score.get('bonus_points', 0)}" if score.get('bonus_points', 0) > 0 else ""
-
-            print(f"{i}. {status_emoji} {candidate['sender']}")
-            print(f"   Score: {score['total']}/100{flags_text}{bonus_text}")
-            print(f"   Date: {candidate['date'][:10]}")
+            total = score['total']
+            timing = score['timing_alignment']
+            financial = score['financial_capability']
+            furniture = score['furniture_acceptance']
+            bonus = score.get('bonus_points', 0)
+            red_flags = candidate['red_flags']
+            flags_text = f" 🚩{len(red_flags)}" if red_flags else ""
+            bonus_text = f" 🎁+{bonus}" if bonus > 0 else ""
+
+            lines.append(f"{i}. {status_emoji(total)} {candidate['sender']}")
+            lines.append(f"   Score: {total}/100{flags_text}{bonus_text}")
+            lines.append(f"   Date: {candidate['date'][:10]}")
 
             # Show YOUR priority scores
-            print(f"   ⏰ Timing: {score['timing_alignment']}/100 | "
-                  f"💰 Financial: {score['financial_capability']}/100 | "
-                  f"🤝 Trust: {score['trustworthiness']}/100")
-            print(f"   🪑 Furniture: {score['furniture_acceptance']}/100 | "
-                  f"✍️ Personal: {score['personalization']}/100")
+            lines.append(f"   ⏰ Timing: {timing}/100 | "
+                         f"💰 Financial: {financial}/100 | "
+                         f"🤝 Trust: {score['trustworthiness']}/100")
+            lines.append(f"   🪑 Furniture: {furniture}/100 | "
+                         f"✍️ Personal: {score['personalization']}/100")
 
             # Show critical issues based on YOUR priorities
-            timing_ok = score['timing_alignment'] >= 70
-            financial_ok = score['financial_capability'] >= 60
-            furniture_ok = score['furniture_acceptance'] >= 60
+            timing_ok = timing >= 70
+            financial_ok = financial >= 60
+            furniture_ok = furniture >= 60
 
             issues = []
             if not timing_ok:
@@ -194,151 +415,146 @@ class SubtenantFinder:
                 issues.append("❌ Financial concerns")
             if not furniture_ok:
                 issues.append("❌ Furniture issues")
-            if candidate['red_flags']:
-                issues.extend([f"🚨 {flag}" for flag in candidate['red_flags']])
+            if red_flags:
+                issues.extend([f"🚨 {flag}" for flag in red_flags])
 
             if issues:
-                print(f"   Issues: {' | '.join(issues)}")
+                lines.append(f"   Issues: {' | '.join(issues)}")
             else:
-                print(f"   ✅ No major issues detected")
-            print()
-
-        print("-" * 70)
-        print("📋 YOUR PRIORITY WEIGHTS:")
-        print("   ⏰ Timing Alignment: 35% (EXACT Sept 2025 - March 2026)")
-        print("   💰 Financial Capability: 25% (636€/month + 1608€ deposit)")
-        print("   🤝 Trustworthiness: 20% (reliable, references, stable)")
-        print("   🪑 Furniture Acceptance: 15% (keep your setup unchanged)")
-        print("   ✍️ Personalization: 5% (thoughtful, non-generic application)")
-        print("\n💡 Green = Excellent (80+) | Yellow = Good (65-79) | Red = Issues (<65)")
+                lines.append(f"   ✅ No major issues detected")
+            lines.append("")
 
-    def identify_top_candidates(self):
-        """Identify candidates who meet YOUR requirements"""
-        candidates = self.get_candidate_rankings()
+        lines.append("-" * 70)
+        lines.append(PRIORITY_WEIGHTS_BLOCK)
 
-        perfect_candidates = []
-        good_candidates = []
-        problematic_candidates = []
-
-        for candidate in candidates:
-            score = candidate['score']
-
-            # Perfect: Great timing + financials + no red flags
-            if (score['total'] >= 80 and
-                    score['timing_alignment'] >= 75 and
-                    score['financial_capability'] >= 65 and
-                    len(candidate['red_flags']) == 0):
-                perfect_candidates.append(candidate)
-
-            # Good: Decent scores, manageable issues
-            elif (score['total'] >= 65 and
-                  score['timing_alignment'] >= 60 and
-                  score['financial_capability'] >= 50):
-                good_candidates.append(candidate)
-
-            # Problematic: Major timing or financial issues
-            else:
-                problematic_candidates.append(candidate)
+        sys.stdout.write("\n".join(lines) + "\n")
 
+    def identify_top_candidates(self):
+        """Identify candidates who meet YOUR requirements"""
+        # Bucketing needs no order; only the few candidates shown are ranked
+        candidates = self.candidates_data["candidates"]
+        table = self.get_score_table()
+        total, timing, financial = table[:, TOTAL], table[:, TIMING], table[:, FINANCIAL]
+
+        # Perfect: Great timing + financials + no red flags
+        perfect = (total >= 80) & (timing >= 75) & (financial >= 65) & (table[:, RED_FLAGS] == 0)
+        # Good: Decent scores, manageable issues
+        good = ~perfect & (total >= 65) & (timing >= 60) & (financial >= 50)
+        # Problematic: Major timing or financial issues
+        problematic = ~(perfect | good)
+
+        perfect_candidates = self.select(candidates, perfect)
+        good_candidates = self.select(candidates, good)
+        problematic_candidates = self.select(candidates, problematic)
+
+        lines = []
         if perfect_candidates:
-            print(f"\n🌟 {len(perfect_candidates)} PERFECT candidates found!")
-            for candidate in perfect_candidates[:3]:
-                timing = candidate['score']['timing_alignment']
-                financial = candidate['score']['financial_capability']
-                furniture = candidate['score']['furniture_acceptance']
-                print(f"   • {candidate['sender']} ({candidate['score']['total']}/100)")
-                print(f"     ⏰ Timing: {timing}/100 | 💰 Financial: {financial}/100 | 🪑 Furniture: {furniture}/100")
+            lines.append(f"\n🌟 {len(perfect_candidates)} PERFECT candidates found!")
+            for candidate in self.top_by_score(perfect_candidates, 3):
+                score = candidate['score']
+                timing = score['timing_alignment']
+                financial = score['financial_capability']
+                furniture = score['furniture_acceptance']
+                lines.append(f"   • {candidate['sender']} ({score['total']}/100)")
+                lines.append(f"     ⏰ Timing: {timing}/100 | 💰 Financial: {financial}/100 | "
+                             f"🪑 Furniture: {furniture}/100")
 
         if good_candidates:
-            print(f"\n👍 {len(good_candidates)} GOOD candidates (minor issues)")
-            for candidate in good_candidates[:2]:
-                print(f"   • {candidate['sender']} ({candidate['score']['total']}/100)")
+            lines.append(f"\n👍 {len(good_candidates)} GOOD candidates (minor issues)")
+            for candidate in self.top_by_score(good_candidates, 2):
+                lines.append(f"   • {candidate['sender']} ({candidate['score']['total']}/100)")
 
         if problematic_candidates:
-            print(f"\n⚠️ {len(problematic_candidates)} PROBLEMATIC candidates")
+            lines.append(f"\n⚠️ {len(problematic_candidates)} PROBLEMATIC candidates")
 
         # Show timing analysis (your most important criterion)
-        exact_timing = [c for c in candidates if c['score']['timing_alignment'] >= 80]
+        exact_timing = self.select(candidates, table[:, TIMING] >= 80)
         if exact_timing:
-            print(f"\n⏰ {len(exact_timing)} candidates have EXCELLENT timing match!")
-            print("   These should be your top priority!")
+            lines.append(f"\n⏰ {len(exact_timing)} candidates have EXCELLENT timing match!")
+            lines.append("   These should be your top priority!")
+
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
         return perfect_candidates
 
     def show_detailed_analysis(self):
         """Show detailed analysis focusing on YOUR priorities"""
-        candidates = self.get_candidate_rankings()
+        candidates = self.candidates_data["candidates"]
 
         if not candidates:
             print("📭 No candidates to analyze yet")
             return
 
-        print("\n" + "🔍 DETAILED ANALYSIS - YOUR PRIORITIES" + "\n")
-        print("=" * 60)
+        # Bucket all candidates with vectorized comparisons on the score columns
+        table = self.get_score_table()
+        timing, financial, furniture = table[:, TIMING], table[:, FINANCIAL], table[:, FURNITURE]
+        has_flags = table[:, RED_FLAGS] > 0
+
+        excellent_timing = self.select(candidates, timing >= 80)
+        good_timing = self.select(candidates, (timing >= 60) & (timing < 80))
+        poor_timing = self.select(candidates, timing < 60)
+        strong_finance = self.select(candidates, financial >= 70)
+        weak_finance = self.select(candidates, financial < 50)
+        furniture_good = self.select(candidates, furniture >= 70)
+        furniture_issues = self.select(candidates, furniture < 50)
+        flagged = self.select(candidates, has_flags)
+        # Core requirements: timing, finances and no red flags
+        qualified = self.select(candidates, (timing >= 70) & (financial >= 60) & ~has_flags)
+
+        lines = []
+        lines.append("\n" + "🔍 DETAILED ANALYSIS - YOUR PRIORITIES" + "\n")
+        lines.append("=" * 60)
 
         # Timing Analysis (Your #1 Priority)
-        print("⏰ TIMING ANALYSIS (35% weight - Most Important)")
-        excellent_timing = [c for c in candidates if c['score']['timing_alignment'] >= 80]
-        good_timing = [c for c in candidates if 60 <= c['score']['timing_alignment'] < 80]
-        poor_timing = [c for c in candidates if c['score']['timing_alignment'] < 60]
-
-        print(f"   🟢 Excellent (80+): {len(excellent_timing)} candidates")
-        print(f"   🟡 Good (60-79): {len(good_timing)} candidates")
-        print(f"   🔴 Poor (<60): {len(poor_timing)} candidates")
+        lines.append("⏰ TIMING ANALYSIS (35% weight - Most Important)")
+        lines.append(f"   🟢 Excellent (80+): {len(excellent_timing)} candidates")
+        lines.append(f"   🟡 Good (60-79): {len(good_timing)} candidates")
+        lines.append(f"   🔴 Poor (<60): {len(poor_timing)} candidates")
 
         if excellent_timing:
-            print("   🎯 FOCUS ON THESE (perfect timing):")
-            for c in excellent_timing[:3]:
-                print(f"      • {c['sender']} ({c['score']['timing_alignment']}/100)")
+            lines.append("   🎯 FOCUS ON THESE (perfect timing):")
+            for c in self.top_by_score(excellent_timing, 3):
+                lines.append(f"      • {c['sender']} ({c['score']['timing_alignment']}/100)")
 
         # Financial Analysis (Your #2 Priority)
-        print(f"\n💰 FINANCIAL ANALYSIS (25% weight)")
-        strong_finance = [c for c in candidates if c['score']['financial_capability'] >= 70]
-        weak_finance = [c for c in candidates if c['score']['financial_capability'] < 50]
-
-        print(f"   🟢 Strong finances (70+): {len(strong_finance)} candidates")
-        print(f"   🔴 Financial concerns (<50): {len(weak_finance)} candidates")
+        lines.append(f"\n💰 FINANCIAL ANALYSIS (25% weight)")
+        lines.append(f"   🟢 Strong finances (70+): {len(strong_finance)} candidates")
+        lines.append(f"   🔴 Financial concerns (<50): {len(weak_finance)} candidates")
 
         # Furniture Analysis (Important for you)
-        print(f"\n🪑 FURNITURE ACCEPTANCE (15% weight)")
-        furniture_good = [c for c in candidates if c['score']['furniture_acceptance'] >= 70]
-        furniture_issues = [c for c in candidates if c['score']['furniture_acceptance'] < 50]
-
-        print(f"   🟢 Will keep your setup (70+): {len(furniture_good)} candidates")
-        print(f"   🔴 Furniture issues (<50): {len(furniture_issues)} candidates")
+        lines.append(f"\n🪑 FURNITURE ACCEPTANCE (15% weight)")
+        lines.append(f"   🟢 Will keep your setup (70+): {len(furniture_good)} candidates")
+        lines.append(f"   🔴 Furniture issues (<50): {len(furniture_issues)} candidates")
 
         if furniture_issues:
-            print("   ⚠️ Watch out for these (might change your furniture):")
-            for c in furniture_issues[:2]:
-                print(f"      • {c['sender']} ({c['score']['furniture_acceptance']}/100)")
+            lines.append("   ⚠️ Watch out for these (might change your furniture):")
+            for c in self.top_by_score(furniture_issues, 2):
+                lines.append(f"      • {c['sender']} ({c['score']['furniture_acceptance']}/100)")
 
         # Red Flags Summary
-        flagged = [c for c in candidates if c['red_flags']]
         if flagged:
-            print(f"\n🚩 RED FLAGS SUMMARY")
-            print(f"   {len(flagged)} candidates have issues:")
-            for c in flagged[:3]:
-                print(f"   • {c['sender']}: {', '.join(c['red_flags'])}")
+            lines.append(f"\n🚩 RED FLAGS SUMMARY")
+            lines.append(f"   {len(flagged)} candidates have issues:")
+            for c in self.top_by_score(flagged, 3):
+                lines.append(f"   • {c['sender']}: {', '.join(c['red_flags'])}")
 
         # Final Recommendations
-        print(f"\n🎯 RECOMMENDATIONS BASED ON YOUR PRIORITIES:")
-
-        # Filter for candidates that meet your core requirements
-        qualified = [c for c in candidates if
-                     c['score']['timing_alignment'] >= 70 and
-                     c['score']['financial_capability'] >= 60 and
-                     len(c['red_flags']) == 0]
+        lines.append(f"\n🎯 RECOMMENDATIONS BASED ON YOUR PRIORITIES:")
 
         if qualified:
-            print(f"   ✅ {len(qualified)} candidates meet your basic requirements")
-            print("   📋 Interview these candidates:")
-            for i, c in enumerate(qualified[:3], 1):
-                print(f"      {i}. {c['sender']} (Score: {c['score']['total']}/100)")
-                print(f"         ⏰ Timing: {c['score']['timing_alignment']}/100 | "
-                      f"💰 Finance: {c['score']['financial_capability']}/100")
+            lines.append(f"   ✅ {len(qualified)} candidates meet your basic requirements")
+            lines.append("   📋 Interview these candidates:")
+            for i, c in enumerate(self.top_by_score(qualified, 3), 1):
+                score = c['score']
+                lines.append(f"      {i}. {c['sender']} (Score: {score['total']}/100)")
+                lines.append(f"         ⏰ Timing: {score['timing_alignment']}/100 | "
+                             f"💰 Finance: {score['financial_capability']}/100")
         else:
-            print("   ⚠️ No candidates meet all basic requirements yet")
-            print("   💡 Consider adjusting criteria or waiting for more applications")
+            lines.append("   ⚠️ No candidates meet all basic requirements yet")
+            lines.append("   💡 Consider adjusting criteria or waiting for more applications")
+
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def run_analysis(self):
         """Main function to run the tenant analysis with YOUR priorities"""
@@ -367,9 +583,26 @@ class SubtenantFinder:
             print(f"   📈 Observation phase: ~{int(total_candidates * 0.37)} candidates")
             print(f"   🎯 Next: Implement secretary algorithm (see readme Day 5-6)")
 
+    def run_forever(self):
+        """Keep checking for new emails, backing off while the inbox is quiet (Ctrl+C to stop)"""
+        while True:
+            if self.process_new_emails():
+                self.poll_interval_minutes = EMAIL_CONFIG['check_interval_minutes']
+                self.show_dashboard()
+            else:
+                # Next check is scheduled only after this one finished
+                self.poll_interval_minutes = min(self.poll_interval_minutes * 2,
+                                                 EMAIL_CONFIG['max_check_interval_minutes'])
+
+            print(f"\n⏳ Next check in {self.poll_interval_minutes} minutes...")
+            time.sleep(self.poll_interval_minutes * 60)
+
 
 def main():
     """Main entry point"""
+    # Evaluator and reader progress goes through logging; show it like the rest of the CLI output
+    setup_logging()
+
     print("🏠 Subtenant Finder - YOUR Real Priorities System")
     print("=" * 60)
 
@@ -399,9 +632,10 @@ def main():
             print("1. Process new emails and update dashboard")
             print("2. Just show dashboard with existing data")
             print("3. Show detailed analysis")
+            print("4. Keep watching for new emails")
 
             try:
-                choice = input("\nWhat would you like to do? (1/2/3): ").strip()
+                choice = input("\nWhat would you like to do? (1/2/3/4): ").strip()
 
                 if choice == "2":
                     finder.show_dashboard()
@@ -409,6 +643,8 @@ def main():
                 elif choice == "3":
                     finder.show_dashboard()
                     finder.show_detailed_analysis()
+                elif choice == "4":
+                    finder.run_forever()
                 else:
                     finder.run_analysis()
 
@@ -0,0 +1,35 @@
+# rate_limiter.py
+
+import time
+import asyncio
+import threading
+
+
+class TokenBucket:
+    """Async token bucket: at most `rate` acquisitions per `period` seconds, bursts up to `rate`
+
+    The state is guarded by a thread lock rather than an asyncio.Lock, so one bucket can
+    enforce a process-wide quota for coroutines on different event loops.
+    """
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+
+            await asyncio.sleep(wait)
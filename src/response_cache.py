@@ -0,0 +1,99 @@
+# response_cache.py
+
+import os
+import time
+import sqlite3
+import hashlib
+from typing import Dict, Optional, Protocol
+
+import fast_json
+from config import CACHE_CONFIG
+
+
+class CacheBackend(Protocol):
+    """Storage used by ResponseCache"""
+
+    def get(self, key: str) -> Optional[Dict]:
+        ...
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None):
+        ...
+
+
+class MemoryBackend:
+    """In-process dict backend (lost when the process exits)"""
+
+    def __init__(self):
+        self.entries: Dict[str, tuple] = {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored value, or None if missing or expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.time():
+            del self.entries[key]
+            return None
+        return value
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None):
+        """Store value, expiring after ttl seconds (never if None)"""
+        self.entries[key] = (time.time() + ttl if ttl else None, value)
+
+
+class SqliteBackend:
+    """Persistent single-file backend"""
+
+    def __init__(self, path: str = CACHE_CONFIG['path']):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the stored value, or None if missing or expired"""
+        row = self.conn.execute(
+            "SELECT value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at >= ?)",
+            (key, time.time())
+        ).fetchone()
+        return fast_json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Dict, ttl: Optional[float] = None):
+        """Store (or overwrite) value, expiring after ttl seconds (never if None)"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, fast_json.dumps(value).decode('utf-8'), time.time() + ttl if ttl else None)
+        )
+        self.conn.commit()
+
+
+class ResponseCache:
+    """Exact-match cache of evaluation results keyed by (model, prompt, temperature)"""
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: Optional[float] = CACHE_CONFIG['ttl_seconds']):
+        if backend is None:
+            backend = SqliteBackend() if CACHE_CONFIG['backend'] == 'sqlite' else MemoryBackend()
+        self.backend = backend
+        self.ttl = ttl
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, temperature: float) -> str:
+        """Content address for a prompt sent to a given model with given sampling"""
+        payload = fast_json.dumps({"model": model_name, "prompt": prompt, "temperature": temperature},
+                                  sort_keys=True)
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key, or None on a miss"""
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Dict):
+        """Store (or overwrite) the result for key"""
+        self.backend.set(key, value, ttl=self.ttl)
@@ -0,0 +1,200 @@
+# semantic_cache.py
+
+import os
+import json
+import atexit
+import hashlib
+import logging
+import functools
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import fast_json
+from config import SEMANTIC_CACHE_CONFIG
+
+# Conventional signature delimiter ("-- " on its own line)
+SIGNATURE_DELIMITER = "\n-- \n"
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_body(body: str) -> str:
+    """Drop the signature, casefold and collapse whitespace so reformatted copies compare equal"""
+    body = body.split(SIGNATURE_DELIMITER, 1)[0]
+    return " ".join(body.casefold().split())
+
+
+def body_hash(body: str) -> str:
+    """Exact-match key of an email body (after normalize_body)"""
+    return hashlib.blake2b(normalize_body(body).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class SemanticCache:
+    """Reuses scores of duplicate and near-duplicate applications.
+
+    Two tiers: a hash of the normalized body catches copies of the same template
+    without computing an embedding; otherwise bodies are embedded with a small local
+    sentence-transformers model and searched in a FAISS inner-product index. Index
+    and scores (as JSON next to it) are saved to disk every save_every additions and
+    at exit. Both libraries are optional: if either is missing only the hash tier is used.
+    """
+
+    def __init__(self,
+                 model_name: str = SEMANTIC_CACHE_CONFIG['model'],
+                 threshold: float = SEMANTIC_CACHE_CONFIG['threshold'],
+                 body_chars: int = SEMANTIC_CACHE_CONFIG['body_chars'],
+                 index_path: str = SEMANTIC_CACHE_CONFIG['index_path'],
+                 results_path: str = SEMANTIC_CACHE_CONFIG['results_path'],
+                 save_every: int = SEMANTIC_CACHE_CONFIG['save_every']):
+        self.threshold = threshold
+        self.body_chars = body_chars
+        self.index_path = os.path.expanduser(index_path)
+        self.results_path = os.path.expanduser(results_path)
+        self.save_every = save_every
+        self.unsaved = 0  # Additions since the last save
+        self.available = False  # Embedding tier usable
+        self.results: List[Dict] = []
+        self.hashes: Dict[str, int] = {}  # body_hash -> row in results
+        atexit.register(self.save)
+
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            logger.warning("⚠️  Semantic cache limited to exact duplicates (%s not installed)", e.name)
+            self.load()
+            return
+
+        self.faiss = faiss
+        self.encoder = SentenceTransformer(model_name)
+        self.index = faiss.IndexFlatIP(self.encoder.get_sentence_embedding_dimension())
+        self.embed = functools.lru_cache(maxsize=256)(self._encode)
+        self.available = True
+        self.load()
+
+    def read_saved(self) -> Optional[Tuple[Dict, object]]:
+        """(saved scores, FAISS index or None) from disk; None if missing or inconsistent"""
+        if not os.path.exists(self.results_path):
+            return None
+
+        try:
+            with open(self.results_path, 'rb') as f:
+                saved = fast_json.loads(f.read())
+            index = self.faiss.read_index(self.index_path) if self.available else None
+        except (RuntimeError, OSError, json.JSONDecodeError) as e:
+            logger.warning("⚠️  Could not read semantic cache (%s)", e)
+            return None
+
+        # An older file layout, a different embedding model or a half-written save makes the files unusable
+        if (not isinstance(saved, dict) or len(saved.get('hashes', ())) != len(saved.get('results', ()))
+                or (index is not None and (index.d != self.index.d or index.ntotal != len(saved['results'])))):
+            logger.warning("⚠️  Semantic cache files don't match, ignoring them")
+            return None
+        return saved, index
+
+    def load(self):
+        """Restore the index and scores saved by a previous run (starts empty if unusable)"""
+        files = self.read_saved()
+        if files is None:
+            return
+
+        saved, index = files
+        if index is not None:
+            self.index = index
+        self.results = saved['results']
+        self.hashes = {key: row for row, key in enumerate(saved['hashes'])}
+        logger.info("♻️  Loaded semantic cache with %d previous evaluations", len(self.results))
+
+    def merge_saved(self):
+        """Take over entries another process saved since our load, so our save keeps them"""
+        files = self.read_saved()
+        if files is None:
+            return
+
+        saved, index = files
+        rows = [row for row, key in enumerate(saved['hashes']) if key not in self.hashes]
+        if index is not None and rows:
+            self.index.add(np.vstack([index.reconstruct(row) for row in rows]))
+        for row in rows:
+            self.hashes[saved['hashes'][row]] = len(self.results)
+            self.results.append(saved['results'][row])
+
+    def save(self):
+        """Merge with the files on disk, then write the index (if available) and scores
+
+        Runs only if something was added. Each file is written to a temporary path and
+        renamed, so a crash mid-write leaves the previous save intact; load() discards an
+        index and scores that don't belong together. Processes sharing the files (pool
+        workers) take turns through a lock file where fcntl is available.
+        """
+        if not self.unsaved:
+            return
+
+        os.makedirs(os.path.dirname(self.results_path), exist_ok=True)
+        with open(self.results_path + ".lock", 'wb') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self.merge_saved()
+            if self.available:
+                os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+                self.replace_file(self.index_path, lambda tmp_path: self.faiss.write_index(self.index, tmp_path))
+            data = fast_json.dumps({"hashes": list(self.hashes), "results": self.results})
+            self.replace_file(self.results_path, lambda tmp_path: self.write_bytes(tmp_path, data))
+        self.unsaved = 0
+
+    def replace_file(self, path: str, write):
+        """Call write(tmp_path), then atomically move the temporary file over path"""
+        tmp_path = path + ".tmp"
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, RuntimeError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def write_bytes(self, path: str, data: bytes):
+        """Write data and flush it to disk before the rename"""
+        with open(path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _encode(self, text: str):
+        """Normalized float32 embedding, so inner product == cosine similarity"""
+        vector = self.encoder.encode([text[:self.body_chars]], normalize_embeddings=True)
+        return vector.astype('float32')
+
+    def lookup(self, body: str) -> Optional[Tuple[Dict, float]]:
+        """Return (cached result, similarity) for the closest previous email above threshold"""
+        row = self.hashes.get(body_hash(body))
+        if row is not None:
+            return self.results[row], 1.0
+
+        if not self.available or self.index.ntotal == 0:
+            return None
+
+        similarities, ids = self.index.search(self.embed(body), 1)
+        similarity = float(similarities[0][0])
+        if similarity > self.threshold:
+            return self.results[ids[0][0]], similarity
+        return None
+
+    def add(self, body: str, result: Dict):
+        """Remember the result for this email body"""
+        key = body_hash(body)
+        if key in self.hashes:
+            return
+
+        if self.available:
+            self.index.add(self.embed(body))
+        self.hashes[key] = len(self.results)
+        self.results.append(result)
+        self.unsaved += 1
+        if self.unsaved >= self.save_every:
+            self.save()
@@ -0,0 +1,22 @@
+# helpers.py - shared by the tests in this directory
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_evaluator import AIEvaluator, NormalizedEmail
+
+
+def make_email(body: str, subject: str = "Zimmer Jutastraße") -> NormalizedEmail:
+    """NormalizedEmail without the tokenizer (test bodies are shorter than the excerpt budget)"""
+    return NormalizedEmail(sender="applicant@example.com", subject=subject, body_excerpt=body,
+                           text_lower=f"{subject}\n{body}".casefold())
+
+
+def make_evaluator() -> AIEvaluator:
+    """Evaluator without Gemini setup or caches - for code paths that never call the model"""
+    evaluator = AIEvaluator.__new__(AIEvaluator)
+    evaluator.cache = None
+    evaluator.semantic_cache = None
+    return evaluator
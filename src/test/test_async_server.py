@@ -0,0 +1,69 @@
+# test_async_server.py
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_evaluator import AsyncEvaluatorServer, run_on_evaluation_loop
+
+
+class RecordingEvaluator:
+    """Stands in for AIEvaluator: everything goes to Gemini, a batch scores its own size"""
+
+    def __init__(self):
+        self.batches = []
+
+    def triage(self, emails):
+        return emails, [None] * len(emails), list(range(len(emails)))
+
+    async def evaluate_batch_async(self, emails, rate_limiter=None):
+        self.batches.append(list(emails))
+        return [len(emails)] * len(emails)
+
+
+async def submit_and_close(evaluator, count: int, max_batch: int):
+    """Queue `count` submissions that never fill a batch in time, then close the server"""
+    server = AsyncEvaluatorServer(evaluator, max_batch=max_batch, max_wait=60)
+    callers = [asyncio.create_task(server.submit(f"email {i}")) for i in range(count)]
+    await asyncio.sleep(0)  # Let the callers queue up; max_wait never expires
+    await server.close()
+    return await asyncio.wait_for(asyncio.gather(*callers), 1)
+
+
+def test_close_dispatches_unfinished_batch():
+    """Submissions in a half-filled batch are answered on close, not left hanging"""
+    evaluator = RecordingEvaluator()
+    scores = asyncio.run(submit_and_close(evaluator, count=3, max_batch=10))
+    assert scores == [3, 3, 3]
+    assert evaluator.batches == [["email 0", "email 1", "email 2"]]
+
+
+def test_close_splits_queued_submissions_into_batches():
+    """A backlog larger than max_batch is drained on close in batches of at most max_batch"""
+    evaluator = RecordingEvaluator()
+    scores = asyncio.run(submit_and_close(evaluator, count=25, max_batch=10))
+    assert len(scores) == 25
+    assert [len(batch) for batch in evaluator.batches] == [10, 10, 5]
+    assert [email for batch in evaluator.batches for email in batch] == [f"email {i}" for i in range(25)]
+
+
+def test_sync_calls_share_one_loop():
+    """Synchronous entry points reuse one event loop, also when called from inside another loop"""
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    async def from_other_loop():
+        return run_on_evaluation_loop(current_loop())
+
+    first = run_on_evaluation_loop(current_loop())
+    assert run_on_evaluation_loop(current_loop()) is first
+    assert asyncio.run(from_other_loop()) is first
+
+
+if __name__ == "__main__":
+    test_close_dispatches_unfinished_batch()
+    test_close_splits_queued_submissions_into_batches()
+    test_sync_calls_share_one_loop()
+    print("✅ Async evaluator server tests passed")
@@ -1,11 +1,15 @@
 # test_gemini_fix.py
 
 import os
+import re
 import google.generativeai as genai
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Outermost {...} of a response (first '{' to last '}')
+JSON_BLOCK_RE = re.compile(r"\{[\s\S]*\}")
+
 
 def test_gemini_response_extraction():
     """Test the fixed Gemini response extraction"""
@@ -74,21 +78,10 @@ RESPOND WITH ONLY THIS JSON FORMAT:
         # Try to parse as JSON
         import json
         try:
-            # Clean the response
-            if extracted_text.startswith('```json'):
-                start = extracted_text.find('{')
-                end = extracted_text.rfind('}') + 1
-                extracted_text = extracted_text[start:end]
-            elif extracted_text.startswith('```'):
-                start = extracted_text.find('{')
-                end = extracted_text.rfind('}') + 1
-                extracted_text = extracted_text[start:end]
-
-            # Find JSON in response if mixed with other text
-            if '{' in extracted_text and '}' in extracted_text:
-                start = extracted_text.find('{')
-                end = extracted_text.rfind('}') + 1
-                extracted_text = extracted_text[start:end]
+            # Clean the response: keep the JSON object, dropping ``` fences or surrounding text
+            match = JSON_BLOCK_RE.search(extracted_text)
+            if match:
+                extracted_text = match.group(0)
 
             data = json.loads(extracted_text)
             print("✅ JSON parsing successful!")
@@ -112,18 +105,13 @@ def extract_response_text_fixed(response) -> str:
         print(f"🔍 Response type: {type(response)}")
 
         # Method 1: Try candidates path first (most reliable for new API)
-        if hasattr(response, 'candidates') and response.candidates:
-            print(f"✅ Found {len(response.candidates)} candidates")
-            candidate = response.candidates[0]
-
-            if hasattr(candidate, 'content') and candidate.content:
-                content = candidate.content
-                if hasattr(content, 'parts') and content.parts:
-                    print(f"✅ Found {len(content.parts)} parts")
-                    part = content.parts[0]
-                    if hasattr(part, 'text') and part.text:
-                        print("✅ Using candidates[0].content.parts[0].text")
-                        return part.text
+        try:
+            text = response.candidates[0].content.parts[0].text
+        except (AttributeError, IndexError, TypeError):
+            text = None
+        if text:
+            print("✅ Using candidates[0].content.parts[0].text")
+            return text
 
         # Method 2: Try direct text access (only for simple responses)
         try:
@@ -0,0 +1,129 @@
+# test_local_scoring.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_evaluator import (LOCAL_AUTOMATON, LOCAL_PATTERNS, LOCAL_MASK_TABLE, build_keyword_patterns,
+                          build_mask_table, build_decided_table, scan_mask, scan_keywords)
+from config import LOCAL_SCORING
+from helpers import make_email, make_evaluator
+
+# Wants to stay for years; "unbefristeten" contains the timing keyword "befristet"
+OPEN_ENDED_APPLICATION = (
+    "Hallo, ich bin Tom und arbeite als Ingenieur bei Siemens mit einem unbefristeten Arbeitsvertrag. "
+    "Ich suche ein möbliertes Zimmer in Neuhausen und möchte gerne mehrere Jahre bleiben. "
+    "Die Kaution kann ich sofort bezahlen, Referenzen meines Vermieters sende ich gerne."
+)
+
+# Decides every criterion with keywords alone
+CONFIDENT_APPLICATION = (
+    "Ich suche eine Zwischenmiete von September 2025 bis März 2026 für mein Auslandssemester. "
+    "Die Wohnung in der Jutastraße ist möbliert, perfekt für mich. Finanziell bin ich durch "
+    "BAföG und einen Werkstudentenjob abgesichert, Referenzen gebe ich gerne."
+)
+
+
+def scan(text: str) -> dict:
+    """Local keyword scores of text; both scan paths (Aho-Corasick and regex) must agree"""
+    matched = scan_keywords(text, None, LOCAL_PATTERNS, LOCAL_MASK_TABLE)
+    if LOCAL_AUTOMATON is not None:
+        assert scan_keywords(text, LOCAL_AUTOMATON, LOCAL_PATTERNS, LOCAL_MASK_TABLE) == matched
+    return matched
+
+
+def test_keywords_match_at_word_start_only():
+    """"befristet" inside "unbefristeten" is no timing keyword, but inflected forms still count"""
+    assert 'timing_alignment' not in scan("unbefristeten arbeitsvertrag")
+    assert scan("befristet bis märz")['timing_alignment'] == 85
+    assert scan("two semesters abroad")['timing_alignment'] == 85
+
+
+def test_cues_score_their_criterion():
+    """Each keyword hit scores only its own criterion; a plain question scores nothing"""
+    assert scan("hallo, ich suche ein zimmer.") == {}
+    assert scan("zwischenmiete ab september, ich bin werkstudent") == {'timing_alignment': 85,
+                                                                        'financial_capability': 75}
+    assert scan("dear sir/madam, i love neuhausen") == {'personalization': 25}
+
+
+def test_lowest_score_wins_within_a_criterion():
+    """Wanting to bring own furniture outweighs liking the furnished room"""
+    assert scan("fully furnished, perfect") == {'furniture_acceptance': 80}
+    assert scan("furnished is fine but i bring my own furniture") == {'furniture_acceptance': 20}
+    assert scan("auslandssemester, aber vielleicht auch mehrere jahre") == {'timing_alignment': 20}
+
+
+def test_conflicting_cues_are_not_decided():
+    """A criterion with both a positive and a negative keyword hit takes the lower score but is undecided"""
+    rules = [('furniture_acceptance', 80, ['furnished']), ('furniture_acceptance', 20, ['own furniture'])]
+    patterns = build_keyword_patterns(rules)
+    mask = scan_mask("nice furnished room, but i bring my own furniture", None, patterns)
+    assert build_mask_table(rules)[mask] == {'furniture_acceptance': 20}
+    assert build_decided_table(rules)[mask] == 0
+    assert build_decided_table(rules)[scan_mask("nice furnished room", None, patterns)] == 1
+
+
+def test_open_ended_stay_is_not_a_timing_match():
+    """"mehrere Jahre" with an "unbefristeten Arbeitsvertrag" must not score as an exact timing match"""
+    score, _ = make_evaluator().local_fast_score(make_email(OPEN_ENDED_APPLICATION))
+    assert score.timing_alignment < 50
+
+    # Staying longer next to an exact-date cue is a conflict: timing is not decided
+    conflicting = make_email(OPEN_ENDED_APPLICATION + " Einzug ab September wäre ideal.")
+    score, confidence = make_evaluator().local_fast_score(conflicting)
+    assert score.timing_alignment < 50
+    assert confidence < 1
+
+
+def test_confident_sample_goes_to_gemini():
+    """Ordinary applications hit a keyword for every criterion, so triage must still send them to Gemini"""
+    evaluator = make_evaluator()
+    _, confidence = evaluator.local_fast_score(make_email(CONFIDENT_APPLICATION))
+    assert confidence == 1
+
+    _, results, pending = evaluator.triage([{'sender': 'a@example.com', 'subject': 'Zimmer',
+                                             'body': CONFIDENT_APPLICATION}])
+    assert pending == [0] and results == [None]
+
+
+def test_fast_path_scores_locally_when_enabled():
+    """With the fast path switched on, the same application is scored without Gemini"""
+    evaluator = make_evaluator()
+    LOCAL_SCORING['fast_path_enabled'] = True
+    try:
+        _, results, pending = evaluator.triage([{'sender': 'a@example.com', 'subject': 'Zimmer',
+                                                 'body': CONFIDENT_APPLICATION}])
+    finally:
+        LOCAL_SCORING['fast_path_enabled'] = False
+    assert pending == []
+    assert results[0].reasoning.startswith("Local keyword scoring")
+
+
+def test_gemini_scores_are_not_blended_by_default():
+    """Gemini's criterion scores are kept as they are unless blending is switched on"""
+    evaluator = make_evaluator()
+    gemini = evaluator.compute_score({'timing_alignment': 95, 'financial_capability': 90, 'trustworthiness': 90,
+                                      'furniture_acceptance': 95, 'personalization': 90, 'reasoning': "Gemini"})
+    local_score, _ = evaluator.local_fast_score(make_email("Hallo, ist das Zimmer noch frei?"))
+    assert evaluator.blend_with_local(gemini, local_score) == gemini
+
+    LOCAL_SCORING['blend_enabled'] = True
+    try:
+        blended = evaluator.blend_with_local(gemini, local_score)
+    finally:
+        LOCAL_SCORING['blend_enabled'] = False
+    assert blended.timing_alignment < gemini.timing_alignment
+
+
+if __name__ == "__main__":
+    test_keywords_match_at_word_start_only()
+    test_cues_score_their_criterion()
+    test_lowest_score_wins_within_a_criterion()
+    test_conflicting_cues_are_not_decided()
+    test_open_ended_stay_is_not_a_timing_match()
+    test_confident_sample_goes_to_gemini()
+    test_fast_path_scores_locally_when_enabled()
+    test_gemini_scores_are_not_blended_by_default()
+    print("✅ Local scoring tests passed")
@@ -0,0 +1,82 @@
+# test_prefilter.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from helpers import make_email, make_evaluator
+
+# A perfect applicant for the Sept 2025 - March 2026 sublet
+PERFECT_APPLICATION = (
+    "Hi! I'm Anna, 21 years old, and I'm coming to TUM for my exchange semester from September 2025 "
+    "until March 2026, exactly 7 months. I love that the room is fully furnished and will keep "
+    "everything as it is. My parents support me and I have my deposit ready."
+)
+PERFECT_APPLICATION_DE = (
+    "Hallo, ich bin Lena, 21 Jahre alt und mache ab September 2025 bis März 2026 mein Auslandssemester "
+    "in München, also genau 7 Monate. Das möblierte Zimmer ist perfekt, ich übernehme alles so wie es ist. "
+    "Meine Eltern bürgen für die Miete und die Kaution."
+)
+
+
+# Pads fragments past the near-empty minimum with dates that match the sublet
+MOVE_IN = " I would love to move in from September 2025 until March 2026." * 2
+
+
+def test_age_is_not_a_longer_stay():
+    """"21 years old" / "21 Jahre alt" contain "1 year" / "1 jahr" but must not be rejected"""
+    evaluator = make_evaluator()
+    assert evaluator.quick_reject(make_email(PERFECT_APPLICATION)) is None
+    assert evaluator.quick_reject(make_email(PERFECT_APPLICATION_DE)) is None
+
+
+def test_explicit_longer_stay_is_rejected():
+    """Asking to rent for a year or long-term is rejected without a Gemini call"""
+    evaluator = make_evaluator()
+    for request in ("I am looking for a room for 1 year.", "I want to stay for at least two years.",
+                    "Ich suche ein Zimmer für ein Jahr.", "Ich suche langfristig eine Wohnung."):
+        result = evaluator.quick_reject(make_email(request + MOVE_IN))
+        assert result is not None and result.red_flags == ["Wants longer stay"], request
+
+
+def test_bringing_furniture_is_rejected():
+    """Wanting to bring own furniture is rejected without a Gemini call"""
+    evaluator = make_evaluator()
+    for request in ("I'd like to bring furniture of my own.", "Ich möchte meine eigenen Möbel mitbringen."):
+        result = evaluator.quick_reject(make_email(request + MOVE_IN))
+        assert result is not None and result.red_flags == ["Wants to bring own furniture"], request
+
+
+def test_negated_cues_go_to_gemini():
+    """A negated reject cue is no reject ("I will not bring own furniture")"""
+    evaluator = make_evaluator()
+    assert evaluator.quick_reject(make_email("I will not bring own furniture." + MOVE_IN)) is None
+    assert evaluator.quick_reject(make_email("I don't need any new furniture." + MOVE_IN)) is None
+    assert evaluator.quick_reject(make_email("I am not looking for anything long-term." + MOVE_IN)) is None
+
+
+def test_past_durations_go_to_gemini():
+    """Durations that describe the applicant's past are not requests to stay longer"""
+    evaluator = make_evaluator()
+    assert evaluator.quick_reject(make_email("I spent one year in Spain." + MOVE_IN)) is None
+    assert evaluator.quick_reject(make_email("Vor einem Jahr war ich in Berlin." + MOVE_IN)) is None
+    assert evaluator.quick_reject(make_email("Ich bin seit einem Jahr Werkstudentin." + MOVE_IN)) is None
+    assert evaluator.quick_reject(make_email("I am 31 years old and 12 months into my PhD." + MOVE_IN)) is None
+
+
+def test_near_empty_application():
+    """Bodies below the minimum length are rejected without a Gemini call"""
+    result = make_evaluator().quick_reject(make_email("Interested!"))
+    assert result is not None
+    assert result.red_flags == ["Empty or near-empty application"]
+
+
+if __name__ == "__main__":
+    test_age_is_not_a_longer_stay()
+    test_explicit_longer_stay_is_rejected()
+    test_bringing_furniture_is_rejected()
+    test_negated_cues_go_to_gemini()
+    test_past_durations_go_to_gemini()
+    test_near_empty_application()
+    print("✅ Pre-filter tests passed")
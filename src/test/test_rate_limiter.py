@@ -0,0 +1,38 @@
+# test_rate_limiter.py
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rate_limiter import TokenBucket
+
+
+async def time_acquisitions(bucket: TokenBucket, acquisitions: int) -> float:
+    """Seconds until `acquisitions` concurrent acquire() calls have all returned"""
+    start = time.monotonic()
+    await asyncio.gather(*[bucket.acquire() for _ in range(acquisitions)])
+    return time.monotonic() - start
+
+
+def test_full_bucket_allows_a_burst():
+    """A fresh bucket hands out `rate` tokens without waiting"""
+    elapsed = asyncio.run(time_acquisitions(TokenBucket(5, 0.5), 5))
+    assert elapsed < 0.05
+
+
+def test_empty_bucket_waits_for_the_refill():
+    """Past the burst each token waits period / rate (0.1s here)"""
+    elapsed = asyncio.run(time_acquisitions(TokenBucket(5, 0.5), 6))
+    assert 0.09 <= elapsed < 0.3
+
+    elapsed = asyncio.run(time_acquisitions(TokenBucket(5, 0.5), 10))
+    assert 0.45 <= elapsed < 0.75
+
+
+if __name__ == "__main__":
+    test_full_bucket_allows_a_burst()
+    test_empty_bucket_waits_for_the_refill()
+    print("✅ Rate limiter tests passed")
@@ -0,0 +1,30 @@
+# test_response_cache.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_cache import ResponseCache
+
+
+def test_same_request_same_key():
+    """Identical requests map to the same SHA-256 hex key"""
+    key = ResponseCache.make_key("gemini-2.5-flash", "prompt", 0.1)
+    assert key == ResponseCache.make_key("gemini-2.5-flash", "prompt", 0.1)
+    assert len(key) == 64 and int(key, 16) >= 0
+
+
+def test_key_changes_with_the_request():
+    """A different model, prompt or temperature is a different cache entry"""
+    key = ResponseCache.make_key("gemini-2.5-flash", "prompt", 0.1)
+    assert ResponseCache.make_key("gemini-1.5-flash", "prompt", 0.1) != key
+    assert ResponseCache.make_key("gemini-2.5-flash", "Prompt", 0.1) != key
+    assert ResponseCache.make_key("gemini-2.5-flash", "prompt ", 0.1) != key
+    assert ResponseCache.make_key("gemini-2.5-flash", "prompt", 0.2) != key
+
+
+if __name__ == "__main__":
+    test_same_request_same_key()
+    test_key_changes_with_the_request()
+    print("✅ Response cache tests passed")
@@ -0,0 +1,67 @@
+# test_stream_parsing.py
+
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_evaluator import AIEvaluator, JsonObjectTracker
+
+
+def completing_chunk(chunks):
+    """Index of the chunk whose feed() completes the outermost object, or None"""
+    tracker = JsonObjectTracker()
+    for index, chunk in enumerate(chunks):
+        if tracker.feed(chunk):
+            return index
+    return None
+
+
+def test_tracker_completes_on_outer_closing_brace():
+    """An object split across chunks is done with the chunk that closes it, not a nested one"""
+    assert completing_chunk(['{"a": 1}']) == 0
+    assert completing_chunk(['{"a": ', '1', '}', ' trailing']) == 2
+    assert completing_chunk(['```json\n', '{"a": {"b": 2}', '}']) == 2
+
+
+def test_tracker_ignores_braces_in_strings():
+    """Braces inside string values, also after an escaped quote, don't close the object"""
+    assert completing_chunk(['{"reasoning": "has } and { inside"', '}']) == 1
+    assert completing_chunk(['{"reasoning": "escaped \\" quote }"', '}']) == 1
+
+
+def test_tracker_ignores_text_before_the_object():
+    """A stray closing brace or quoted text before the first "{" is skipped"""
+    assert completing_chunk(['} stray brace ', '{"a": 1}']) == 1
+    assert completing_chunk(['"outside" ', '{"a": 1}']) == 1
+
+
+def test_tracker_waits_for_incomplete_object():
+    """An unclosed object or a reply without JSON never completes"""
+    assert completing_chunk(['{"a": {"b": 2}']) is None
+    assert completing_chunk(['no json at all']) is None
+
+
+def batch_reply(ids) -> str:
+    """A batched reply with one minimal entry per id"""
+    return json.dumps({"results": [{"id": number, "timing_alignment": 80} for number in ids]})
+
+
+def test_batch_response_ids_must_cover_every_application():
+    """Entries are only used when their ids are exactly 1..N"""
+    evaluator = AIEvaluator.__new__(AIEvaluator)
+    assert sorted(evaluator.parse_batch_response(batch_reply([2, 1, 3]), 3)) == [0, 1, 2]
+    assert evaluator.parse_batch_response(batch_reply([1, 3]), 3) == {}
+    assert evaluator.parse_batch_response(batch_reply([1, 1, 2]), 3) == {}
+    assert evaluator.parse_batch_response(batch_reply([0, 1, 2]), 3) == {}
+    assert evaluator.parse_batch_response(batch_reply(["one", 2, 3]), 3) == {}
+
+
+if __name__ == "__main__":
+    test_tracker_completes_on_outer_closing_brace()
+    test_tracker_ignores_braces_in_strings()
+    test_tracker_ignores_text_before_the_object()
+    test_tracker_waits_for_incomplete_object()
+    test_batch_response_ids_must_cover_every_application()
+    print("✅ Stream parsing tests passed")
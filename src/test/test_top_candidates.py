@@ -0,0 +1,59 @@
+# test_top_candidates.py
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import SubtenantFinder, TOP_CANDIDATES_KEPT
+
+
+def make_finder(candidates) -> SubtenantFinder:
+    """SubtenantFinder with only the state get_top_candidates uses (no Gmail, Gemini or files)"""
+    finder = SubtenantFinder.__new__(SubtenantFinder)
+    finder.candidates_data = {"candidates": list(candidates), "metadata": {}}
+    finder.top_heap = None
+    return finder
+
+
+def candidate(number: int, total: int) -> dict:
+    """Minimal stored candidate with a total score"""
+    return {"id": number, "score": {"total": total}}
+
+
+def top_ids(finder: SubtenantFinder, k: int) -> list:
+    """Ids of the k best candidates, best first"""
+    return [c["id"] for c in finder.get_top_candidates(k)]
+
+
+def test_ties_keep_arrival_order():
+    """Candidates with equal totals are ranked by arrival, also past the heap size"""
+    finder = make_finder([candidate(0, 50), candidate(1, 90), candidate(2, 50), candidate(3, 90)])
+    assert top_ids(finder, 3) == [1, 3, 0]
+    assert top_ids(finder, TOP_CANDIDATES_KEPT + 5) == [1, 3, 0, 2]
+
+
+def test_push_top_after_heap_is_built():
+    """Candidates added with push_top rank as if the heap had been built from all of them"""
+    finder = make_finder([candidate(i, 40 + i % 3) for i in range(TOP_CANDIDATES_KEPT)])
+    assert top_ids(finder, 1) == [2]  # Builds the heap
+
+    for number, total in [(TOP_CANDIDATES_KEPT, 95), (TOP_CANDIDATES_KEPT + 1, 10), (TOP_CANDIDATES_KEPT + 2, 42)]:
+        finder.candidates_data["candidates"].append(candidate(number, total))
+        finder.push_top(len(finder.candidates_data["candidates"]) - 1)
+
+    expected = sorted(finder.candidates_data["candidates"], key=lambda c: c["score"]["total"], reverse=True)
+    assert top_ids(finder, TOP_CANDIDATES_KEPT) == [c["id"] for c in expected[:TOP_CANDIDATES_KEPT]]
+    assert top_ids(finder, 1) == [TOP_CANDIDATES_KEPT]
+
+
+def test_no_candidates():
+    """An empty candidate list gives an empty ranking"""
+    assert top_ids(make_finder([]), 5) == []
+
+
+if __name__ == "__main__":
+    test_ties_keep_arrival_order()
+    test_push_top_after_heap_is_built()
+    test_no_candidates()
+    print("✅ Top candidate tests passed")